@@ -0,0 +1,70 @@
+# tests/test_cache.py
+
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from user_recon.core.cache import RedisProbeCache  # noqa: E402
+
+FOUND = {"site": "GitHub", "found": True, "status": 200}
+MISSING = {"site": "Reddit", "found": False, "status": 404}
+FAILED = {"site": "Twitter", "found": None, "error": "Network error"}
+
+
+@pytest.fixture
+def cache():
+    c = RedisProbeCache(client=fakeredis.FakeRedis(), positive_ttl=60, negative_ttl=30,
+                        error_ttl=0.2)
+    yield c
+    c.close()
+
+
+def test_set_and_get(cache):
+    cache.set("alice", "GitHub", FOUND)
+    assert cache.get("alice", "GitHub") == FOUND
+    assert cache.get("alice", "Reddit") is None
+    assert cache.get("bob", "GitHub") is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_ttl_per_outcome(cache):
+    cache.set("alice", "GitHub", FOUND)
+    cache.set("alice", "Reddit", MISSING)
+    assert 59000 < cache.client.pttl(cache.key("alice", "GitHub")) <= 60000
+    assert 29000 < cache.client.pttl(cache.key("alice", "Reddit")) <= 30000
+
+
+def test_entries_expire(cache):
+    cache.set("alice", "Twitter", FAILED)
+    assert cache.get("alice", "Twitter") == FAILED
+    time.sleep(0.3)
+    assert cache.get("alice", "Twitter") is None
+
+
+def test_zero_ttl_is_not_cached():
+    cache = RedisProbeCache(client=fakeredis.FakeRedis(), error_ttl=0)
+    cache.set("alice", "Twitter", FAILED)
+    assert cache.client.dbsize() == 0
+
+
+def test_get_many_is_one_pipeline(cache, monkeypatch):
+    cache.set("alice", "GitHub", FOUND)
+    cache.set("alice", "Reddit", MISSING)
+    pipelines = []
+    pipeline = cache.client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipelines.append(kwargs)
+        return pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(cache.client, "pipeline", counting_pipeline)
+    monkeypatch.setattr(cache.client, "get", lambda *a: pytest.fail("get() outside the pipeline"))
+
+    found = cache.get_many("alice", ["GitHub", "Reddit", "Twitter"])
+    assert found == {"GitHub": FOUND, "Reddit": MISSING}
+    assert pipelines == [{"transaction": False}]
+    assert cache.stats() == {"hits": 2, "misses": 1}
+    assert cache.get_many("alice", []) == {}
+    assert len(pipelines) == 1
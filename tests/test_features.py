@@ -0,0 +1,33 @@
+# tests/test_features.py
+
+import numpy as np
+import pytest
+
+from user_recon.ml.features import FEATURE_COLUMNS, MAX_PADDED_LENGTH, UsernameFeatureExtractor
+
+
+@pytest.fixture
+def extractor():
+    return UsernameFeatureExtractor()
+
+
+def test_batch_matches_to_vector(extractor):
+    names = ["elhamjvdi", "admin1234", "xX_dark.lord_99_Xx", "aaaabbb", "", "9lives"]
+    batch = extractor.extract_batch(names)
+    assert batch.shape == (len(names), len(FEATURE_COLUMNS))
+    for name, row in zip(names, batch):
+        np.testing.assert_allclose(row, extractor.to_vector(name), atol=1e-3)
+
+
+def test_long_names_are_not_rounded(extractor):
+    long_name = "xX_dark.lord_99_Xx" * 4 + "abc"
+    assert len(long_name) > MAX_PADDED_LENGTH
+    short_name = long_name[:MAX_PADDED_LENGTH]
+    batch = extractor.extract_batch([long_name, short_name])
+    for name, row in zip((long_name, short_name), batch):
+        expected = np.array([
+            len(name), extractor.entropy(name), extractor.digit_ratio(name),
+            extractor.separator_count(name), extractor.repeated_char_ratio(name),
+            name.islower(), name.isupper(), name[0].isdigit(),
+        ], dtype=np.float32)
+        np.testing.assert_allclose(row, expected, rtol=1e-6)
@@ -0,0 +1,76 @@
+# tests/test_work_queue.py
+
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from user_recon.utils.work_queue import QueueWorker, RedisWorkQueue  # noqa: E402
+
+
+@pytest.fixture
+def queue():
+    q = RedisWorkQueue(client=fakeredis.FakeRedis(), name="test:jobs", visibility_timeout=0.2,
+                       max_deliveries=3)
+    yield q
+    q.close()
+
+
+def test_crashed_claim_is_reaped(queue):
+    queue.enqueue(["alice"])
+    job = queue.claim(block=0.1)
+    assert job["username"] == "alice"
+    assert queue.counts() == {"pending": 0, "processing": 1, "dead": 0}
+
+    # The worker dies without acking; nothing moves until the lease runs out
+    assert queue.reap() == 0
+    time.sleep(0.3)
+    assert queue.reap() == 1
+    assert queue.counts() == {"pending": 1, "processing": 0, "dead": 0}
+
+    again = queue.claim(block=0.1)
+    assert again["id"] == job["id"]
+    assert again["deliveries"] == 2
+
+
+def test_failing_job_is_released(queue):
+    queue.enqueue(["alice"])
+
+    def handler(job):
+        raise RuntimeError("scan failed")
+
+    worker = QueueWorker(queue, handler, block=0.1)
+    assert worker.run_once() is True
+    assert worker.processed == 0
+    assert queue.counts() == {"pending": 1, "processing": 0, "dead": 0}
+
+
+def test_job_is_dead_lettered_after_max_deliveries(queue):
+    queue.enqueue(["alice"])
+    for _ in range(queue.max_deliveries):
+        job = queue.claim(block=0.1)
+        assert job is not None
+        queue.release(job)
+    assert queue.counts() == {"pending": 0, "processing": 0, "dead": 1}
+    assert queue.claim(block=0.1) is None
+
+
+def test_ack_delivers_report_to_results(queue):
+    batch = queue.enqueue(["alice", "bob"])
+    worker = QueueWorker(queue, lambda job: {"username": job["username"]}, block=0.1)
+    while worker.run_once():
+        pass
+
+    reports = list(queue.results(batch, 2, timeout=1))
+    assert sorted(r["username"] for r in reports) == ["alice", "bob"]
+    assert worker.processed == 2
+    assert queue.counts() == {"pending": 0, "processing": 0, "dead": 0}
+    assert queue.client.hlen(queue.jobs_key) == 0
+
+
+def test_results_stop_after_timeout_without_reports(queue):
+    batch = queue.enqueue(["alice"])
+    start = time.monotonic()
+    assert list(queue.results(batch, 1, timeout=0.3)) == []
+    assert time.monotonic() - start < 2
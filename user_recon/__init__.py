@@ -13,13 +13,13 @@ __author__ = "User Recon Project"
 __license__ = "MIT"
 
 # Expose core functionality
-from .core.search import search_username
-from .core.ai_compare import compare_usernames
-from .core.patterns import PatternAnalyzer
-from .core.security import SecurityManager
+from .core.search import check_username, check_all_sites
+from .core.ai_compare import AIUsernameComparator
+from .core.patterns import UsernamePatternAnalyzer
+from .core.security import SecurityUtils
 
 # Utility imports
-from .utils.entropy import calculate_entropy
+from .utils.entropy import Entropy
 from .utils.telemetry import Telemetry
 from .utils.logging import get_logger
 
@@ -27,11 +27,12 @@ from .utils.logging import get_logger
 logger = get_logger("user_recon")
 
 __all__ = [
-    "search_username",
-    "compare_usernames",
-    "PatternAnalyzer",
-    "SecurityManager",
-    "calculate_entropy",
+    "check_username",
+    "check_all_sites",
+    "AIUsernameComparator",
+    "UsernamePatternAnalyzer",
+    "SecurityUtils",
+    "Entropy",
     "Telemetry",
     "logger",
 ]
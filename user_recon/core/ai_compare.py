@@ -1,9 +1,20 @@
 # user_recon/core/ai_compare.py
 
+import os
 import re
-from difflib import SequenceMatcher
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+
+from user_recon.core.presence import overlap
+from user_recon.utils.similarity import ratio
+
+# Char 2-4-grams hashed into a fixed space: no vocabulary to fit or store
+NGRAM_RANGE = (2, 4)
+N_FEATURES = 2 ** 20
+DEFAULT_IDF_PATH = "models/username_idf.pkl"
+SAME_USER_SCORE = 0.8       # compare()'s "Highly likely same user" cut, on a 0-1 scale
 
 
 class AIUsernameComparator:
@@ -11,49 +22,118 @@ class AIUsernameComparator:
     AI-powered username comparator.
     Uses hybrid logic: string similarity + ML vectorization.
     Returns similarity percentage + human-readable reasoning.
+    - Usernames are vectorized by a stateless char n-gram HashingVectorizer,
+      weighted by IDF fitted once on a reference corpus (fit_reference())
+      and loaded at startup if `idf_path` exists. Scores are therefore
+      comparable across pairs.
+    - compare_many() vectorizes every input in one call and scores all
+      pairs with sparse row products.
     """
 
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(analyzer="char", ngram_range=(2, 4))
+    def __init__(self, idf_path: str = DEFAULT_IDF_PATH, n_features: int = N_FEATURES):
+        self.vectorizer = HashingVectorizer(
+            analyzer="char", ngram_range=NGRAM_RANGE, n_features=n_features,
+            alternate_sign=False, norm=None,
+        )
+        self.idf = None
+        if idf_path and os.path.exists(idf_path):
+            self.idf = joblib.load(idf_path)
+
+    # -------------------------------
+    # Vectorization
+    # -------------------------------
+    def fit_reference(self, usernames, path: str = None):
+        """Fit IDF weights on a reference corpus of usernames; optionally save them."""
+        counts = self.vectorizer.transform([self.normalize(u) for u in usernames])
+        self.idf = TfidfTransformer(norm=None, sublinear_tf=True).fit(counts)
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            joblib.dump(self.idf, path)
+        return self
+
+    def vectorize(self, usernames):
+        """L2-normalized sparse rows for already normalized usernames."""
+        matrix = self.vectorizer.transform(usernames)
+        if self.idf is not None:
+            matrix = self.idf.transform(matrix)
+        return normalize(matrix, norm="l2", copy=False)
 
     def normalize(self, username: str) -> str:
         """Normalize username for comparison."""
         return re.sub(r"[^a-z0-9]", "", username.lower())
 
     def sequence_score(self, u1: str, u2: str) -> float:
-        """Compute ratio using SequenceMatcher."""
-        return SequenceMatcher(None, u1, u2).ratio()
+        """Sequence similarity: 2 * LCS / total length (see utils/similarity.py)."""
+        return ratio(u1, u2)
 
     def tfidf_score(self, u1: str, u2: str) -> float:
-        """Compute cosine similarity using TF-IDF vectorization."""
-        matrix = self.vectorizer.fit_transform([u1, u2])
-        return cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
+        """Compute cosine similarity of the char n-gram TF-IDF vectors."""
+        matrix = self.vectorize([u1, u2])
+        return float(matrix[0].multiply(matrix[1]).sum())
 
     def compare(self, user1: str, user2: str, results1=None, results2=None) -> dict:
         """
-        Compare two usernames and optionally their social media results.
-        Returns dict with similarity % and reasoning.
+        Compare two usernames and optionally their social media results
+        (scan result lists, {site: result} dicts or presence entries; see
+        core/presence.py). Returns dict with similarity % and reasoning.
         """
 
         norm1, norm2 = self.normalize(user1), self.normalize(user2)
+        return self._report(user1, user2, norm1, norm2, self.sequence_score(norm1, norm2),
+                            self.tfidf_score(norm1, norm2), results1, results2)
 
-        seq_score = self.sequence_score(norm1, norm2)
-        tfidf_score = self.tfidf_score(norm1, norm2)
+    def compare_many(self, pairs) -> list:
+        """
+        Compare many (user1, user2) pairs at once.
+        Each distinct username is vectorized once; TF-IDF scores for all
+        pairs come from one sparse element-wise product.
+        Returns one compare()-style dict per pair, in order.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        index = {}
+        for user1, user2 in pairs:
+            index.setdefault(self.normalize(user1), len(index))
+            index.setdefault(self.normalize(user2), len(index))
+        matrix = self.vectorize(list(index))
+        left = np.fromiter((index[self.normalize(u1)] for u1, _ in pairs), dtype=np.int64)
+        right = np.fromiter((index[self.normalize(u2)] for _, u2 in pairs), dtype=np.int64)
+        scores = np.asarray(matrix[left].multiply(matrix[right]).sum(axis=1)).ravel()
+
+        reports = []
+        for (user1, user2), tfidf_score in zip(pairs, scores):
+            norm1, norm2 = self.normalize(user1), self.normalize(user2)
+            reports.append(self._report(user1, user2, norm1, norm2,
+                                        self.sequence_score(norm1, norm2), float(tfidf_score)))
+        return reports
+
+    def compare_all(self, queries, corpus=None, cutoff: float = SAME_USER_SCORE,
+                    workers: int = None):
+        """
+        Many-vs-many comparison on a process pool (see core/pairwise.py).
+        Yields (i, j, score) with score on compare()'s 0-1 scale for every
+        query/corpus pair at or above `cutoff` (must be above 0.5); without
+        a corpus, all pairs i < j within `queries`. Results stream in as
+        chunks finish.
+        """
+        # Imported here: pairwise imports modules that import this one
+        from user_recon.core.pairwise import compare_all
+        return compare_all(self, queries, corpus, cutoff=cutoff, workers=workers)
 
+    def _report(self, user1: str, user2: str, norm1: str, norm2: str, seq_score: float,
+                tfidf_score: float, results1=None, results2=None) -> dict:
+        """Combine the two scores (and shared platforms) into a verdict with reasoning."""
         base_score = (seq_score * 0.5 + tfidf_score * 0.5) * 100
 
         # Boost if many shared platforms
         shared_platforms = 0
         total_checked = 0
         if results1 and results2:
-            for site in results1:
-                if site in results2:
-                    total_checked += 1
-                    if (
-                        results1[site][0] is True
-                        and results2[site][0] is True
-                    ):
-                        shared_platforms += 1
+            footprint = overlap(results1, results2)
+            shared_platforms, total_checked = footprint["shared"], footprint["checked"]
             if total_checked > 0:
                 platform_score = (shared_platforms / total_checked) * 30
                 base_score = min(100, base_score + platform_score)
@@ -102,3 +182,9 @@ if __name__ == "__main__":
     comparator = AIUsernameComparator()
     result = comparator.compare("elhamjvdi", "elham87jvdi")
     print(result)
+
+    import time
+    pairs = [(f"user{i}", f"user_{i * 7}") for i in range(10000)]
+    start = time.time()
+    comparator.compare_many(pairs)
+    print(f"compare_many: {len(pairs)} pairs in {time.time() - start:.2f}s")
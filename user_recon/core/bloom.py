@@ -0,0 +1,236 @@
+# user_recon/core/bloom.py
+
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+
+import numpy as np
+
+from user_recon.core.security import sanitize_input
+
+DEFAULT_CAPACITY = 5_000_000        # confirmed misses per site before a rotation
+DEFAULT_ERROR_RATE = 0.001          # target false-positive rate per site
+DEFAULT_ROTATE_AFTER = 7 * 24 * 3600  # seconds; a miss is forgotten after two rotations
+
+# Header: magic, bit count, hash count, entries added, created (unix time)
+_HEADER = struct.Struct("<8sQIxxxxQd")
+_MAGIC = b"URBLOOM1"
+_HEADER_SIZE = 64
+
+
+def optimal_size(capacity: int, error_rate: float):
+    """Bits and hash count for `capacity` entries at `error_rate`."""
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """
+    Memory-mapped Bloom filter.
+    The bit array lives in a file, so opening one costs no memory up front
+    and pages are loaded as lookups touch them. Positions come from double
+    hashing one blake2b digest, computed for all k hashes at once.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY,
+                 error_rate: float = DEFAULT_ERROR_RATE):
+        self.path = path
+        self._lock = threading.Lock()
+        if not os.path.exists(path):
+            self._create(path, *optimal_size(capacity, error_rate))
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes, self.count, self.created = _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a bloom filter file")
+        self.capacity = capacity
+        self._array = np.frombuffer(self._mm, dtype=np.uint8, offset=_HEADER_SIZE)
+        self._steps = np.arange(self.hashes, dtype=np.uint64)
+
+    @staticmethod
+    def _create(path: str, bits: int, hashes: int):
+        """Write the header and a sparse, zeroed bit array."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            header = _HEADER.pack(_MAGIC, bits, hashes, 0, time.time())
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+            f.truncate(_HEADER_SIZE + bits // 8)
+        os.replace(tmp, path)
+
+    def _positions(self, key: str) -> np.ndarray:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = np.frombuffer(digest, dtype="<u8")
+        with np.errstate(over="ignore"):
+            return (h1 + self._steps * (h2 | np.uint64(1))) % np.uint64(self.bits)
+
+    def add(self, key: str):
+        positions = self._positions(key)
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        with self._lock:
+            np.bitwise_or.at(self._array, positions >> np.uint64(3), masks)
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        return bool(np.all(self._array[positions >> np.uint64(3)] & masks))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def flush(self):
+        """Persist the entry count and dirty pages."""
+        with self._lock:
+            _HEADER.pack_into(self._mm, 0, _MAGIC, self.bits, self.hashes, self.count, self.created)
+            self._mm.flush()
+
+    def close(self):
+        if self._mm.closed:
+            return
+        if getattr(self, "_array", None) is not None:
+            self.flush()
+            # The array is a view onto the map; drop it so the map can close
+            self._array = None
+        self._mm.close()
+        self._file.close()
+
+
+class NegativeFilter:
+    """
+    Per-site filter of confirmed misses for large batch sweeps.
+    - One memory-mapped BloomFilter per site, under `directory`.
+    - Only definite not-found results are added; a hit means "known miss"
+      with at most ~2x `error_rate` false positives.
+    - Rebuilt by rotation: a new generation starts once the current one is
+      `rotate_after` seconds old or full, and lookups check the current and
+      previous generations. Misses are forgotten after two rotations, so
+      newly registered usernames are picked up eventually.
+    """
+
+    def __init__(self, directory: str, capacity: int = DEFAULT_CAPACITY,
+                 error_rate: float = DEFAULT_ERROR_RATE,
+                 rotate_after: float = DEFAULT_ROTATE_AFTER):
+        self.directory = directory
+        self.capacity = capacity
+        # Each lookup can hit either generation
+        self.error_rate = error_rate / 2
+        self.rotate_after = rotate_after
+        self.hits = 0
+        self._filters = {}      # site -> [current, previous or None]
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(username: str, site: str) -> str:
+        return f"{site}\x1f{sanitize_input(username)}"
+
+    def _prefix(self, site: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_-]", "_", site)
+
+    def _generations(self, site: str) -> list:
+        """Generation files for a site, newest first."""
+        prefix = self._prefix(site) + "."
+        names = [n for n in os.listdir(self.directory)
+                 if n.startswith(prefix) and n.endswith(".bloom")]
+        return sorted(names, key=lambda n: int(n[len(prefix):-len(".bloom")]), reverse=True)
+
+    def _open(self, name: str) -> BloomFilter:
+        return BloomFilter(os.path.join(self.directory, name), self.capacity, self.error_rate)
+
+    def _new_generation(self, site: str) -> BloomFilter:
+        return self._open(f"{self._prefix(site)}.{time.time_ns()}.bloom")
+
+    def _site(self, site: str) -> list:
+        """Current and previous filters for a site, rotating if due (caller holds the lock)."""
+        gens = self._filters.get(site)
+        if gens is None:
+            names = self._generations(site)
+            for stale in names[2:]:
+                os.remove(os.path.join(self.directory, stale))
+            gens = [self._open(name) for name in names[:2]]
+            if not gens:
+                gens = [self._new_generation(site)]
+            gens = (gens + [None])[:2]
+            self._filters[site] = gens
+        current = gens[0]
+        if current.full or time.time() - current.created >= self.rotate_after:
+            if gens[1] is not None:
+                gens[1].close()
+                os.remove(gens[1].path)
+            current.flush()
+            gens[:] = [self._new_generation(site), current]
+        return gens
+
+    # -------------------------------
+    # Lookup / record
+    # -------------------------------
+    # Probes run on several threads and a rotation closes the previous
+    # generation, so filters are only touched while holding the lock.
+    def __contains__(self, pair) -> bool:
+        """`(username, site) in filter`: True if it is a known miss."""
+        username, site = pair
+        key = self.key(username, site)
+        with self._lock:
+            if any(f is not None and key in f for f in self._site(site)):
+                self.hits += 1
+                return True
+            return False
+
+    def add(self, username: str, site: str):
+        key = self.key(username, site)
+        with self._lock:
+            self._site(site)[0].add(key)
+
+    def record(self, username: str, site: str, result: dict):
+        """
+        Add a probe result if it is a confirmed miss: a not-found decided by
+        the response itself, not a soft-404 guess from page fingerprints.
+        """
+        if result.get("found") is False and result.get("status") is not None \
+                and not result.get("soft_404"):
+            self.add(username, site)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                site: {"entries": gens[0].count, "created": gens[0].created}
+                for site, gens in self._filters.items()
+            }
+
+    def flush(self):
+        with self._lock:
+            for gens in self._filters.values():
+                for f in gens:
+                    if f is not None:
+                        f.flush()
+
+    def close(self):
+        with self._lock:
+            for gens in self._filters.values():
+                for f in gens:
+                    if f is not None:
+                        f.close()
+            self._filters.clear()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        misses = NegativeFilter(directory, capacity=100000)
+        start = time.time()
+        for i in range(100000):
+            misses.add(f"user{i}", "GitHub")
+        print(f"Added 100k misses in {time.time() - start:.2f}s")
+        false_hits = sum((f"other{i}", "GitHub") in misses for i in range(100000))
+        print(f"False positive rate: {false_hits / 100000:.5f}")
+        misses.close()
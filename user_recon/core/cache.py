@@ -0,0 +1,251 @@
+# user_recon/core/cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from user_recon.core.security import sanitize_input
+
+# Outcome classes, each with its own TTL
+POSITIVE = "positive"
+NEGATIVE = "negative"
+ERROR = "error"
+
+DEFAULT_TTLS = {
+    POSITIVE: 6 * 3600,
+    NEGATIVE: 3600,
+    ERROR: 60,
+}
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def outcome_of(result: dict) -> str:
+    """Classify a check_username result for TTL selection."""
+    if result.get("found") is True:
+        return POSITIVE
+    if result.get("found") is False:
+        return NEGATIVE
+    return ERROR
+
+
+class ProbeCache:
+    """
+    TTL cache for (username, site) probe outcomes.
+    - In-memory LRU tier bounded to max_entries.
+    - Optional SQLite tier at disk_path that survives restarts.
+    Found, not-found and error results expire on separate TTLs;
+    a TTL of 0 disables caching for that outcome.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, positive_ttl: float = None,
+                 negative_ttl: float = None, error_ttl: float = None, disk_path: str = None):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        for name, ttl in ((POSITIVE, positive_ttl), (NEGATIVE, negative_ttl), (ERROR, error_ttl)):
+            if ttl is not None:
+                self.ttls[name] = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS probe_cache ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(username: str, site: str) -> str:
+        """Cache key: sanitized username + site."""
+        return f"{site}\x1f{sanitize_input(username)}"
+
+    # -------------------------------
+    # Lookup / store
+    # -------------------------------
+    def get(self, username: str, site: str):
+        """Return the cached result dict, or None on miss/expiry."""
+        key = self.key(username, site)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return dict(result)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result, expires FROM probe_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    result = json.loads(row[0])
+                    self._remember(key, result, row[1])
+                    self.hits += 1
+                    return dict(result)
+
+            self.misses += 1
+            return None
+
+    def get_many(self, username: str, sites: list) -> dict:
+        """Look up several sites for one username. Returns {site: result} for hits only."""
+        found = {}
+        for site in sites:
+            result = self.get(username, site)
+            if result is not None:
+                found[site] = result
+        return found
+
+    def set(self, username: str, site: str, result: dict):
+        """Store a result under the TTL of its outcome."""
+        ttl = self.ttls[outcome_of(result)]
+        if ttl <= 0:
+            return
+        key = self.key(username, site)
+        expires = time.time() + ttl
+        with self._lock:
+            self._remember(key, result, expires)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO probe_cache (key, result, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), expires),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, result: dict, expires: float):
+        """Insert into the LRU tier, evicting the oldest entry when full."""
+        self._memory[key] = (dict(result), expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # -------------------------------
+    # Maintenance
+    # -------------------------------
+    def stats(self) -> dict:
+        """Return cumulative hit/miss counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers. Returns disk rows removed."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, exp) in self._memory.items() if exp <= now]:
+                del self._memory[key]
+            if self._db is None:
+                return 0
+            cur = self._db.execute("DELETE FROM probe_cache WHERE expires <= ?", (now,))
+            self._db.commit()
+            return cur.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM probe_cache")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class RedisProbeCache:
+    """
+    Redis-backed probe cache shared by every worker.
+    Same interface as ProbeCache; get_many() answers a whole SITES fan-out
+    with one pipelined round trip. Entries expire through Redis TTLs.
+    Pass `client` to use an existing connection or an in-process stand-in
+    (e.g. fakeredis.FakeRedis()).
+    """
+
+    def __init__(self, client=None, url: str = "redis://localhost:6379/0",
+                 prefix: str = "user_recon:probe:", positive_ttl: float = None,
+                 negative_ttl: float = None, error_ttl: float = None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.ttls = dict(DEFAULT_TTLS)
+        for name, ttl in ((POSITIVE, positive_ttl), (NEGATIVE, negative_ttl), (ERROR, error_ttl)):
+            if ttl is not None:
+                self.ttls[name] = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, username: str, site: str) -> str:
+        return self.prefix + ProbeCache.key(username, site)
+
+    def _count(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get(self, username: str, site: str):
+        """Return the cached result dict, or None on miss."""
+        raw = self.client.get(self.key(username, site))
+        if raw is None:
+            self._count(0, 1)
+            return None
+        self._count(1, 0)
+        return json.loads(raw)
+
+    def get_many(self, username: str, sites: list) -> dict:
+        """Pipelined multi-get. Returns {site: result} for hits only."""
+        sites = list(sites)
+        if not sites:
+            return {}
+        pipe = self.client.pipeline(transaction=False)
+        for site in sites:
+            pipe.get(self.key(username, site))
+        found = {}
+        for site, raw in zip(sites, pipe.execute()):
+            if raw is not None:
+                found[site] = json.loads(raw)
+        self._count(len(found), len(sites) - len(found))
+        return found
+
+    def set(self, username: str, site: str, result: dict):
+        """Store a result with the TTL of its outcome."""
+        ttl = self.ttls[outcome_of(result)]
+        if ttl <= 0:
+            return
+        # Redis expiries are whole milliseconds
+        self.client.set(self.key(username, site), json.dumps(result), px=max(1, int(ttl * 1000)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Delete every key under this cache's prefix."""
+        keys = list(self.client.scan_iter(match=self.prefix + "*", count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def close(self):
+        self.client.close()
+
+
+if __name__ == "__main__":
+    cache = ProbeCache(max_entries=2)
+    cache.set("elhamjvdi", "GitHub", {"site": "GitHub", "found": True, "status": 200})
+    print(cache.get("elhamjvdi", "GitHub"))
+    print(cache.get("elhamjvdi", "Reddit"))
+    print(cache.stats())
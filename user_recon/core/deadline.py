@@ -0,0 +1,47 @@
+# user_recon/core/deadline.py
+
+import time
+
+MIN_PROBE_TIMEOUT = 0.1     # seconds; never hand requests a zero timeout
+
+
+class Deadline:
+    """
+    One time budget shared by every stage of a scan.
+    Created once per scan and passed down; each stage asks how much is left
+    instead of carrying its own timeout.
+    """
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("deadline must be positive")
+        self.budget = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def clamp(self, timeout: float) -> float:
+        """A per-request timeout cut down to what is left of the budget."""
+        return max(MIN_PROBE_TIMEOUT, min(timeout, self.remaining()))
+
+    def __repr__(self):
+        return f"<Deadline {self.remaining():.2f}s of {self.budget}s left>"
+
+
+def as_deadline(value):
+    """Accept a Deadline, a number of seconds, or None (no limit)."""
+    if value is None or isinstance(value, Deadline):
+        return value
+    return Deadline(float(value))
+
+
+def incomplete_result(site: str, url: str) -> dict:
+    """Result for a site that didn't finish within the deadline."""
+    return {"site": site, "url": url, "found": None, "incomplete": True,
+            "error": "deadline exceeded"}
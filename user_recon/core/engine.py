@@ -0,0 +1,358 @@
+# user_recon/core/engine.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from user_recon.core.search import check_username, profile_url, preflight
+from user_recon.core.sites import REGISTRY
+from user_recon.core.probe import DEFAULT_MAX_BYTES
+from user_recon.core.cache import ProbeCache
+from user_recon.core.session import SessionPool
+from user_recon.core.scheduler import HostScheduler
+from user_recon.core.health import SiteHealth, CLOSED
+from user_recon.core.fingerprint import SoftNotFoundFingerprints
+from user_recon.core.bloom import NegativeFilter
+from user_recon.core.store import ResultStore
+from user_recon.core.deadline import Deadline, as_deadline, incomplete_result
+from user_recon.utils.logging import get_logger
+from user_recon.utils.retry_queue import enqueue_retry
+
+logger = get_logger(__name__)
+
+# Global cap on in-flight site probes
+DEFAULT_CONCURRENCY = 16
+
+
+class ScanEngine:
+    """
+    Asyncio scan engine.
+    Probes every site in parallel under a global concurrency limit, so a scan is
+    bounded by the slowest host; reuse one engine across usernames to keep its
+    connections, host rates and site health.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, sites=None,
+                 session_pool: SessionPool = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 cache: ProbeCache = None, scheduler: HostScheduler = None,
+                 health: SiteHealth = None, telemetry=None,
+                 fingerprints: SoftNotFoundFingerprints = None,
+                 negative_filter: NegativeFilter = None, store: ResultStore = None,
+                 max_age: float = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.sites = list(sites) if sites is not None else REGISTRY.names()
+        self.hosts = {site: REGISTRY[site].host for site in self.sites}
+        self.scheduler = scheduler or HostScheduler(concurrency)
+        self.health = health or SiteHealth(telemetry=telemetry)
+        self.fingerprints = fingerprints
+        self.negative_filter = negative_filter
+        self.store = store
+        self.max_age = max_age
+        # Only close pools we created ourselves
+        self._owns_pool = session_pool is None
+        self.session_pool = session_pool or SessionPool(pool_maxsize=concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="user-recon-probe"
+        )
+
+    # -------------------------------
+    # Async API
+    # -------------------------------
+    @staticmethod
+    def new_stats() -> dict:
+        """Empty per-scan counters, filled in by scan()/scan_async()."""
+        return {
+            "sites": 0, "not_applicable": 0, "cache": {"hits": 0, "misses": 0}, "stored": 0,
+            "filtered": 0, "skipped": 0, "deferred": 0, "incomplete": 0, "breakers": {},
+        }
+
+    def _check(self, username: str, site: str, deadline: Deadline = None,
+               previous: dict = None) -> dict:
+        """
+        Blocking probe; feeds SiteHealth and writes the fresh result to the
+        cache, the history store and, for confirmed misses, the negative filter.
+        A probe cut short by the deadline is incomplete, not a site failure;
+        a half-open breaker trial that ends that way is abandoned.
+        `previous` is the stored result to revalidate with a conditional request.
+        """
+        timeout = site_timeout = self.health.timeout(site)
+        if deadline is not None:
+            if deadline.expired:
+                self.health.abandon(site)
+                return incomplete_result(site, profile_url(username, site))
+            timeout = deadline.clamp(site_timeout)
+        start = time.monotonic()
+        result = check_username(username, site, session_pool=self.session_pool,
+                                max_bytes=self.max_bytes, timeout=timeout,
+                                fingerprints=self.fingerprints, previous=previous)
+        if timeout < site_timeout and result.get("status") is None and result["found"] is None:
+            self.health.abandon(site)
+            return incomplete_result(site, result.get("url"))
+        self.health.record(site, time.monotonic() - start, result, timeout=timeout)
+        if self.cache is not None:
+            self.cache.set(username, site, result)
+        if self.store is not None:
+            self.store.record(username, result)
+        if self.negative_filter is not None:
+            self.negative_filter.record(username, site, result)
+        return result
+
+    async def _probe(self, username: str, site: str, deadline: Deadline = None,
+                     previous: dict = None) -> dict:
+        """Run a single blocking probe on the engine's thread pool."""
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._executor, partial(self._check, username, site, deadline, previous)
+        )
+        self.scheduler.feedback(self.hosts[site], result.get("status"), result.get("retry_after"))
+        logger.info(f"[{site}] {result}")
+        return result
+
+    async def _fan_out(self, usernames: list, stats: dict, emit, deadline: Deadline = None):
+        """
+        Resolve every (username, site) pair, calling emit(ui, si, result)
+        as each one completes. When the deadline runs out, outstanding probes
+        are cancelled and every pair not yet emitted is emitted as incomplete.
+        """
+        if deadline is None:
+            await self._resolve(usernames, stats, emit)
+        else:
+            pending = {(ui, si) for ui in range(len(usernames)) for si in range(len(self.sites))}
+
+            def emit_once(ui, si, result):
+                pending.discard((ui, si))
+                if result.get("incomplete"):
+                    stats["incomplete"] += 1
+                emit(ui, si, result)
+
+            try:
+                await asyncio.wait_for(self._resolve(usernames, stats, emit_once, deadline),
+                                       deadline.remaining())
+            except asyncio.TimeoutError:
+                for ui, si in sorted(pending):
+                    site = self.sites[si]
+                    emit_once(ui, si, incomplete_result(site, profile_url(usernames[ui], site)))
+        states = {site: self.health.state(site) for site in self.sites}
+        stats["breakers"] = {site: state for site, state in states.items() if state != CLOSED}
+        if self.store is not None:
+            self.store.flush()
+
+    async def _resolve(self, usernames: list, stats: dict, emit, deadline: Deadline = None):
+        """
+        Sites the username can't exist on, cache hits, fresh stored results,
+        known misses and open breakers are emitted first; the rest are probed
+        through the HostScheduler. Probes for a host paused by a long
+        Retry-After are emitted as rate limited and queued for retry instead.
+        Probes that never finish (deadline, max_hits, aclose) abandon their
+        breaker trials.
+        """
+        loop = asyncio.get_running_loop()
+        jobs = []
+
+        for ui, username in enumerate(usernames):
+            # Pre-flight: per-site username rules, no I/O
+            candidates = []
+            for si, site in enumerate(self.sites):
+                stats["sites"] += 1
+                skipped = preflight(username, site)
+                if skipped is not None:
+                    stats["not_applicable"] += 1
+                    emit(ui, si, skipped)
+                else:
+                    candidates.append((si, site))
+
+            cached = {}
+            if self.cache is not None and candidates:
+                # One batched lookup for the whole fan-out
+                cached = await loop.run_in_executor(
+                    self._executor, self.cache.get_many, username,
+                    [site for _, site in candidates],
+                )
+            stored = {}
+            if self.store is not None:
+                stored = await loop.run_in_executor(
+                    self._executor, self.store.latest, username,
+                    [site for _, site in candidates if site not in cached],
+                )
+            cutoff = time.time() - self.max_age if self.max_age is not None else None
+            for si, site in candidates:
+                hit = cached.get(site)
+                if hit is not None:
+                    stats["cache"]["hits"] += 1
+                    hit["cached"] = True
+                    emit(ui, si, hit)
+                    continue
+                if self.cache is not None:
+                    stats["cache"]["misses"] += 1
+                previous = stored.get(site)
+                if previous is not None and cutoff is not None and previous["checked_at"] >= cutoff:
+                    # Incremental rescan: only stale sites get probed
+                    stats["stored"] += 1
+                    previous["stored"] = True
+                    emit(ui, si, previous)
+                    continue
+                if self.negative_filter is not None and (username, site) in self.negative_filter:
+                    stats["filtered"] += 1
+                    emit(ui, si, {
+                        "site": site, "url": profile_url(username, site), "found": False,
+                        "filtered": True,
+                    })
+                    continue
+                if not self.health.allow(site):
+                    stats["skipped"] += 1
+                    emit(ui, si, {
+                        "site": site, "url": profile_url(username, site), "found": None,
+                        "skipped": True, "error": "skipped: circuit open",
+                    })
+                    continue
+                jobs.append((self.hosts[site], (ui, si, username, site, previous)))
+
+        unfinished = {(ui, si): site for _, (ui, si, _, site, _) in jobs}
+
+        async def handle(job):
+            ui, si, username, site, previous = job
+            result = await self._probe(username, site, deadline, previous)
+            del unfinished[(ui, si)]
+            emit(ui, si, result)
+
+        def defer(job, paused):
+            ui, si, username, site, _ = job
+            stats["deferred"] += 1
+            error = "Rate limited, queued for retry"
+            loop.run_in_executor(self._executor, partial(
+                enqueue_retry, username, site, retry_after=paused, error=error))
+            emit(ui, si, {
+                "site": site, "url": profile_url(username, site), "found": None,
+                "deferred": True, "retry_after": round(paused, 3), "error": error,
+            })
+
+        max_pause = None
+        if deadline is not None:
+            max_pause = min(self.scheduler.max_pause, deadline.remaining())
+        try:
+            await self.scheduler.run(jobs, handle, defer=defer, max_pause=max_pause)
+        finally:
+            for site in set(unfinished.values()):
+                self.health.abandon(site)
+
+    async def scan_many_async(self, usernames: list, stats: dict = None, deadline=None) -> list:
+        """
+        Scan several usernames in one politely scheduled batch.
+        Probes are interleaved across hosts by the HostScheduler.
+        Returns one list of result dicts (registry order) per username.
+        """
+        if stats is None:
+            stats = self.new_stats()
+        reports = [[None] * len(self.sites) for _ in usernames]
+
+        def emit(ui, si, result):
+            reports[ui][si] = result
+
+        await self._fan_out(usernames, stats, emit, as_deadline(deadline))
+        return reports
+
+    async def scan_async(self, username: str, stats: dict = None, deadline=None) -> list:
+        """
+        Probe all sites concurrently.
+        Returns list of result dicts in registry order, like check_all_sites.
+        Pass a dict from new_stats() as `stats` to collect per-scan counters.
+        """
+        return (await self.scan_many_async([username], stats=stats, deadline=deadline))[0]
+
+    async def astream(self, username: str, stats: dict = None, max_hits: int = None,
+                      deadline=None):
+        """
+        Async iterator over site results in completion order.
+        Stops after `max_hits` found profiles if given; breaking out early
+        (or aclose()) cancels the probes still outstanding.
+        """
+        if stats is None:
+            stats = self.new_stats()
+        queue = asyncio.Queue()
+        task = asyncio.ensure_future(
+            self._fan_out([username], stats, lambda ui, si, result: queue.put_nowait(result),
+                          as_deadline(deadline))
+        )
+        # Sentinel once every result has been emitted (or the fan-out failed)
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        hits = 0
+        try:
+            while True:
+                result = await queue.get()
+                if result is None:
+                    task.result()
+                    return
+                yield result
+                if result.get("found") is True:
+                    hits += 1
+                    if max_hits is not None and hits >= max_hits:
+                        return
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    # -------------------------------
+    # Sync API
+    # -------------------------------
+    def scan(self, username: str, stats: dict = None, deadline=None) -> list:
+        """Blocking wrapper around scan_async()."""
+        return asyncio.run(self.scan_async(username, stats=stats, deadline=deadline))
+
+    def scan_many(self, usernames: list, stats: dict = None, deadline=None) -> list:
+        """Blocking wrapper around scan_many_async()."""
+        return asyncio.run(self.scan_many_async(usernames, stats=stats, deadline=deadline))
+
+    def stream(self, username: str, stats: dict = None, max_hits: int = None, deadline=None):
+        """
+        Blocking generator over astream(): yields site results as they
+        complete. Closing the generator cancels outstanding probes.
+        """
+        loop = asyncio.new_event_loop()
+        results = self.astream(username, stats=stats, max_hits=max_hits, deadline=deadline)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
+
+    def close(self):
+        """Release the probe thread pool and, if owned, the session pool."""
+        self._executor.shutdown(wait=True)
+        if self._owns_pool:
+            self.session_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scan_all_sites(username: str, concurrency: int = DEFAULT_CONCURRENCY) -> list:
+    """
+    Concurrent drop-in for check_all_sites.
+    Returns list of result dicts.
+    """
+    with ScanEngine(concurrency=concurrency) as engine:
+        return engine.scan(username)
+
+
+if __name__ == "__main__":
+    start = time.time()
+    results = scan_all_sites("elhamjvdi")
+    print(f"Checked {len(results)} sites in {time.time() - start:.2f}s")
+    for r in results:
+        print(r)
@@ -0,0 +1,126 @@
+# user_recon/core/fingerprint.py
+
+import hashlib
+import random
+import re
+import string
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_TTL = 24 * 3600     # refresh a site's fingerprint daily
+FAILURE_RETRY = 60.0        # wait before re-fetching after a failed fingerprint probe
+DEFAULT_THRESHOLD = 6       # max Hamming distance (of 64 bits) to call it the same page
+
+_TOKEN_RE = re.compile(rb"[A-Za-z0-9]{3,}")
+
+
+def simhash(data: bytes) -> int:
+    """
+    64-bit SimHash of a page prefix over its alphanumeric tokens.
+    Near-identical pages (differing only in nonces, usernames, timestamps)
+    land within a few bits of each other.
+    """
+    tokens = _TOKEN_RE.findall(data)
+    if not tokens:
+        return 0
+    digests = b"".join(hashlib.blake2b(t, digest_size=8).digest() for t in tokens)
+    # One row of 64 bits per token; a bit is set if most tokens set it
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8),
+                         axis=1, bitorder="little")
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(tokens)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def random_username(site_def, length: int = 14) -> str:
+    """A lowercase handle that satisfies the site's rules and almost surely doesn't exist."""
+    for _ in range(20):
+        name = "zq" + "".join(random.choices(string.ascii_lowercase + string.digits, k=length - 2))
+        if site_def.accepts(name):
+            return name
+        length = max(3, length - 2)
+    return None
+
+
+class SoftNotFoundFingerprints:
+    """
+    Per-site soft-404 fingerprint cache.
+    Probes a known-random username once per site, keeps only the SimHash
+    of its bounded response prefix, and classifies later 200 responses
+    by Hamming distance to it. Fingerprints are refreshed after `ttl`.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, threshold: int = DEFAULT_THRESHOLD):
+        self.ttl = ttl
+        self.threshold = threshold
+        self._prints = {}       # site -> (simhash or None, fetched_at)
+        self._site_locks = {}
+        self._lock = threading.Lock()
+
+    def _site_lock(self, site: str) -> threading.Lock:
+        with self._lock:
+            return self._site_locks.setdefault(site, threading.Lock())
+
+    def _fresh(self, entry, now: float) -> bool:
+        """True if a (simhash, fetched_at) entry is still usable."""
+        if entry is None:
+            return False
+        max_age = self.ttl if entry[0] is not None else FAILURE_RETRY
+        return now - entry[1] < max_age
+
+    def fingerprint(self, site: str, fetch):
+        """
+        Cached fingerprint for a site. `fetch()` returns the body prefix for a
+        random username and is called at most once per TTL (one caller at a time).
+        Returns None if no fingerprint is available.
+        """
+        entry = self._prints.get(site)
+        if self._fresh(entry, time.time()):
+            return entry[0]
+        with self._site_lock(site):
+            # Another thread may have refreshed it while we waited
+            entry = self._prints.get(site)
+            if self._fresh(entry, time.time()):
+                return entry[0]
+            try:
+                body = fetch()
+            except Exception:
+                body = None
+            value = simhash(body) if body else None
+            self._prints[site] = (value, time.time())
+            return value
+
+    def learn(self, site: str, body: bytes):
+        """Set a site's fingerprint from a known not-found body."""
+        self._prints[site] = (simhash(body), time.time())
+
+    def is_soft_404(self, site: str, body: bytes, fetch) -> bool:
+        """True if the body matches the site's not-found fingerprint."""
+        if not body:
+            return False
+        reference = self.fingerprint(site, fetch)
+        if reference is None:
+            return False
+        return hamming(simhash(body), reference) <= self.threshold
+
+    def invalidate(self, site: str = None):
+        """Force a refresh for one site, or all of them."""
+        if site is None:
+            self._prints.clear()
+        else:
+            self._prints.pop(site, None)
+
+
+# -------------------------------
+# Process-wide default cache
+# -------------------------------
+_default_fingerprints = SoftNotFoundFingerprints()
+
+
+def get_fingerprints() -> SoftNotFoundFingerprints:
+    return _default_fingerprints
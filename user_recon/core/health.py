@@ -0,0 +1,160 @@
+# user_recon/core/health.py
+
+import threading
+import time
+from collections import defaultdict, deque
+
+DEFAULT_TIMEOUT = 10.0      # used until a site has enough samples
+MIN_TIMEOUT = 2.0
+MAX_TIMEOUT = 10.0
+DEFAULT_WINDOW = 50         # latency samples kept per site
+MIN_SAMPLES = 5
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_FACTOR = 2.0        # headroom over the percentile
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 300.0    # seconds a tripped breaker stays open
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+def is_failure(result: dict) -> bool:
+    """Network errors, timeouts and 5xx count against a site's breaker."""
+    if result.get("found") is not None:
+        return False
+    status = result.get("status")
+    return status is None or status >= 500
+
+
+class SiteHealth:
+    """
+    Per-site health tracking for the scan engine.
+    - Rolling latency window per site; the probe timeout is derived from
+      its percentile instead of a fixed 10s. Timed-out probes count as
+      samples at their timeout, so a site that slows down raises its own
+      timeout instead of failing at the old one forever.
+    - Circuit breaker: after `failure_threshold` consecutive failures a site
+      is skipped for `cooldown` seconds, then one trial probe decides
+      whether it closes again.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, percentile: float = TIMEOUT_PERCENTILE,
+                 factor: float = TIMEOUT_FACTOR, min_timeout: float = MIN_TIMEOUT,
+                 max_timeout: float = MAX_TIMEOUT,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_COOLDOWN, telemetry=None):
+        self.percentile_rank = percentile
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.telemetry = telemetry
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._failures = defaultdict(int)
+        self._state = defaultdict(lambda: CLOSED)
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------
+    # Latency / timeouts
+    # -------------------------------
+    def percentile(self, site: str, p: float) -> float:
+        """Latency percentile for a site, or None without samples."""
+        with self._lock:
+            samples = sorted(self._latencies[site])
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def timeout(self, site: str) -> float:
+        """
+        Probe timeout for a site, derived from its latency percentile.
+        A half-open trial gets DEFAULT_TIMEOUT, so it isn't failed by the
+        same timeout that tripped the breaker.
+        """
+        with self._lock:
+            enough = len(self._latencies[site]) >= MIN_SAMPLES
+            trial = self._state[site] == HALF_OPEN
+        if not enough or trial:
+            return DEFAULT_TIMEOUT
+        value = self.percentile(site, self.percentile_rank) * self.factor
+        return round(min(self.max_timeout, max(self.min_timeout, value)), 3)
+
+    # -------------------------------
+    # Circuit breaker
+    # -------------------------------
+    def allow(self, site: str) -> bool:
+        """
+        True if the site may be probed now.
+        An open breaker past its cooldown lets exactly one trial through.
+        """
+        with self._lock:
+            state = self._state[site]
+            if state == CLOSED:
+                return True
+            if state == OPEN and time.time() - self._opened_at[site] >= self.cooldown:
+                self._transition(site, HALF_OPEN)
+                return True
+            return False
+
+    def record(self, site: str, latency: float, result: dict, timeout: float = None):
+        """
+        Feed one probe outcome into the latency window and the breaker.
+        Pass the probe's `timeout`: a network failure that took at least that
+        long timed out and is kept as a (censored) sample at the timeout.
+        """
+        failed = is_failure(result)
+        with self._lock:
+            if failed and timeout is not None and result.get("status") is None \
+                    and latency >= timeout:
+                self._latencies[site].append(timeout)
+            if not failed:
+                self._latencies[site].append(latency)
+                self._failures[site] = 0
+                if self._state[site] != CLOSED:
+                    self._transition(site, CLOSED)
+                return
+            self._failures[site] += 1
+            if self._state[site] == HALF_OPEN or self._failures[site] >= self.failure_threshold:
+                self._opened_at[site] = time.time()
+                if self._state[site] != OPEN:
+                    self._transition(site, OPEN)
+
+    def abandon(self, site: str):
+        """
+        A probe ended without an outcome (cut short by a deadline or
+        cancelled). If it was the half-open trial, the breaker goes back to
+        open with its original opening time, so the next allow() after the
+        cooldown lets a new trial through instead of blocking the site forever.
+        """
+        with self._lock:
+            if self._state[site] == HALF_OPEN:
+                self._transition(site, OPEN)
+
+    def _transition(self, site: str, state: str):
+        """Change breaker state (lock held) and report it to telemetry."""
+        self._state[site] = state
+        if self.telemetry is not None:
+            self.telemetry.log_circuit_state(site, state, self._failures[site])
+
+    def state(self, site: str) -> str:
+        with self._lock:
+            return self._state[site]
+
+    def snapshot(self) -> dict:
+        """Breaker state, failure streak and timeout for every site seen."""
+        with self._lock:
+            sites = set(self._state) | set(self._latencies)
+        return {
+            site: {
+                "state": self.state(site),
+                "failures": self._failures[site],
+                "p95": self.percentile(site, 95),
+                "timeout": self.timeout(site),
+            }
+            for site in sorted(sites)
+        }
@@ -0,0 +1,201 @@
+# user_recon/core/index.py
+
+import heapq
+import json
+import os
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from user_recon.core.ai_compare import AIUsernameComparator
+from user_recon.utils.similarity import ratio_many
+
+DEFAULT_CHUNK_ROWS = 250000     # corpus rows scored per sparse mat-vec
+BUILD_BATCH = 100000            # usernames vectorized per batch while building
+RERANK_FACTOR = 10              # candidates pulled per result when re-ranking
+
+_META = "meta.json"
+_IDF = "idf.pkl"
+
+
+def csr_rows(data, indices, indptr, start: int, end: int, n_features: int) -> csr_matrix:
+    """Rows [start, end) of a CSR matrix stored as (memory-mapped) arrays, without copying."""
+    lo, hi = int(indptr[start]), int(indptr[end])
+    local = (indptr[start:end + 1] - lo).astype(np.int32)
+    return csr_matrix((data[lo:hi], indices[lo:hi], local),
+                      shape=(end - start, n_features), copy=False)
+
+
+class UsernameIndex:
+    """
+    One-vs-corpus similarity search over millions of usernames.
+    - The corpus is stored as an L2-normalized char 2-4-gram TF-IDF CSR
+      matrix (raw data / indices / indptr files plus a name table), built
+      once with build() and memory-mapped by open(). Opening costs no
+      memory up front; pages load as queries touch them.
+    - A query is vectorized with the same comparator settings and scored
+      against the corpus by cosine (a dot product of unit rows), one
+      row chunk at a time, keeping the best k in a heap.
+    - Optional re-ranking blends in the sequence score (batched LCS ratio)
+      over the top candidates, the same 50/50 mix AIUsernameComparator.compare()
+      uses.
+    """
+
+    def __init__(self, directory: str, comparator: AIUsernameComparator = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        with open(os.path.join(directory, _META), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.size = self.meta["rows"]
+        self.n_features = self.meta["n_features"]
+
+        if comparator is None:
+            comparator = AIUsernameComparator(idf_path=None, n_features=self.n_features)
+            idf_path = os.path.join(directory, _IDF)
+            if os.path.exists(idf_path):
+                comparator.idf = joblib.load(idf_path)
+        self.comparator = comparator
+
+        nnz = self.meta["nnz"]
+        self.data = self._map("data.f32", np.float32, nnz)
+        self.indices = self._map("indices.i32", np.int32, nnz)
+        self.indptr = self._map("indptr.i64", np.int64, self.size + 1)
+        self.name_offsets = self._map("names.i64", np.int64, self.size + 1)
+        self.names = self._map("names.bin", np.uint8, int(self.name_offsets[-1]))
+
+    def _map(self, name: str, dtype, count: int) -> np.ndarray:
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(os.path.join(self.directory, name), dtype=dtype, mode="r",
+                         shape=(count,))
+
+    # -------------------------------
+    # Build
+    # -------------------------------
+    @classmethod
+    def build(cls, usernames, directory: str, comparator: AIUsernameComparator = None,
+              batch_size: int = BUILD_BATCH) -> "UsernameIndex":
+        """
+        Vectorize an iterable of usernames into an index under `directory`.
+        Streams in batches, so the corpus never has to fit in memory.
+        """
+        comparator = comparator or AIUsernameComparator()
+        os.makedirs(directory, exist_ok=True)
+        files = {name: open(os.path.join(directory, name), "wb")
+                 for name in ("data.f32", "indices.i32", "indptr.i64", "names.bin", "names.i64")}
+        rows = nnz = name_bytes = 0
+        try:
+            files["indptr.i64"].write(np.zeros(1, dtype=np.int64).tobytes())
+            files["names.i64"].write(np.zeros(1, dtype=np.int64).tobytes())
+            batch = []
+
+            def flush():
+                nonlocal rows, nnz, name_bytes
+                matrix = comparator.vectorize([comparator.normalize(u) for u in batch])
+                matrix.sort_indices()
+                files["data.f32"].write(matrix.data.astype(np.float32).tobytes())
+                files["indices.i32"].write(matrix.indices.astype(np.int32).tobytes())
+                files["indptr.i64"].write((matrix.indptr[1:].astype(np.int64) + nnz).tobytes())
+                encoded = [u.encode("utf-8") + b"\n" for u in batch]
+                ends = np.cumsum([len(e) for e in encoded], dtype=np.int64) + name_bytes
+                files["names.bin"].write(b"".join(encoded))
+                files["names.i64"].write(ends.tobytes())
+                rows += len(batch)
+                nnz += matrix.nnz
+                name_bytes = int(ends[-1])
+                batch.clear()
+
+            for username in usernames:
+                batch.append(username)
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        finally:
+            for f in files.values():
+                f.close()
+
+        if comparator.idf is not None:
+            joblib.dump(comparator.idf, os.path.join(directory, _IDF))
+        with open(os.path.join(directory, _META), "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "nnz": nnz,
+                       "n_features": comparator.vectorizer.n_features}, f)
+        return cls(directory, comparator=comparator)
+
+    # -------------------------------
+    # Query
+    # -------------------------------
+    def name(self, row: int) -> str:
+        start, end = self.name_offsets[row], self.name_offsets[row + 1]
+        return self.names[start:end - 1].tobytes().decode("utf-8")
+
+    def _chunk(self, start: int, end: int) -> csr_matrix:
+        """Rows [start, end) as a CSR matrix over views of the mapped arrays."""
+        return csr_rows(self.data, self.indices, self.indptr, start, end, self.n_features)
+
+    def _top(self, query: np.ndarray, k: int) -> list:
+        """Best k (score, row) pairs for a dense unit query vector, best first."""
+        heap = []
+        for start in range(0, self.size, self.chunk_rows):
+            end = min(self.size, start + self.chunk_rows)
+            scores = self._chunk(start, end) @ query
+            if len(scores) > k:
+                best = np.argpartition(scores, -k)[-k:]
+            else:
+                best = np.arange(len(scores))
+            for row in best:
+                item = (float(scores[row]), start + int(row))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return sorted(heap, reverse=True)
+
+    def search(self, username: str, k: int = 10, rerank: bool = False) -> list:
+        """
+        Top-k corpus usernames most similar to `username` by cosine.
+        With rerank, the top k * RERANK_FACTOR candidates are re-scored with
+        the sequence score blended 50/50 with cosine.
+        Returns dicts with username and score (plus sequence_score if re-ranked).
+        """
+        if self.size == 0 or k <= 0:
+            return []
+        norm = self.comparator.normalize(username)
+        vector = self.comparator.vectorize([norm])
+        query = np.zeros(self.n_features, dtype=np.float32)
+        query[vector.indices] = vector.data
+
+        candidates = self._top(query, k * RERANK_FACTOR if rerank else k)
+        hits = [{"username": self.name(row), "score": round(score, 4)} for score, row in candidates]
+        if not rerank:
+            return hits
+        sequence = ratio_many(norm, [self.comparator.normalize(h["username"]) for h in hits])
+        for hit, seq in zip(hits, sequence):
+            hit["sequence_score"] = round(float(seq), 4)
+            hit["score"] = round(0.5 * float(seq) + 0.5 * hit["score"], 4)
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits[:k]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+if __name__ == "__main__":
+    import random
+    import string
+    import tempfile
+    import time
+
+    random.seed(7)
+    corpus = ("".join(random.choices(string.ascii_lowercase + string.digits + "_",
+                                     k=random.randint(5, 14))) for _ in range(1000000))
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.time()
+        index = UsernameIndex.build(corpus, directory)
+        print(f"Built index of {len(index)} usernames in {time.time() - start:.1f}s")
+        start = time.time()
+        print(index.search("elhamjvdi", k=5))
+        print(f"Query in {time.time() - start:.3f}s")
+        print(index.search("elhamjvdi", k=5, rerank=True))
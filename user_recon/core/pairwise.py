@@ -0,0 +1,189 @@
+# user_recon/core/pairwise.py
+
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+
+from user_recon.core.ai_compare import SAME_USER_SCORE
+from user_recon.core.index import csr_rows
+from user_recon.utils.similarity import ratio_many
+
+QUERY_CHUNK = 256               # query rows per pool task
+CORPUS_BLOCK = 65536            # corpus rows per sparse product inside a task
+
+# Per-process state, set up once by _init_worker
+_state = {}
+
+
+def _scratch_dir():
+    """RAM-backed directory when available, so mapped pages never touch disk."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _dump(directory: str, prefix: str, matrix, names: list):
+    """Write a CSR matrix and its row names as .npy files that workers can map."""
+    encoded = [n.encode("utf-8") for n in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    parts = {
+        "data": matrix.data.astype(np.float32),
+        "indices": matrix.indices.astype(np.int32),
+        "indptr": matrix.indptr.astype(np.int64),
+        "shape": np.array(matrix.shape, dtype=np.int64),
+        "names": np.frombuffer(b"".join(encoded) or b"\0", dtype=np.uint8),
+        "offsets": offsets,
+    }
+    for name, array in parts.items():
+        np.save(os.path.join(directory, f"{prefix}.{name}.npy"), array)
+
+
+def _load(directory: str, prefix: str) -> dict:
+    """Memory-map a matrix written by _dump(); no copy per process."""
+    return {
+        name: np.load(os.path.join(directory, f"{prefix}.{name}.npy"), mmap_mode="r")
+        for name in ("data", "indices", "indptr", "shape", "names", "offsets")
+    }
+
+
+def _rows(part: dict, start: int, stop: int):
+    return csr_rows(part["data"], part["indices"], part["indptr"], start, stop,
+                    int(part["shape"][1]))
+
+
+def _name(part: dict, i: int) -> str:
+    lo, hi = part["offsets"][i], part["offsets"][i + 1]
+    return part["names"][lo:hi].tobytes().decode("utf-8")
+
+
+def _init_worker(directory: str, self_join: bool, cutoff: float, block: int):
+    _state["queries"] = _load(directory, "queries")
+    _state["corpus"] = _state["queries"] if self_join else _load(directory, "corpus")
+    _state["self_join"] = self_join
+    _state["cutoff"] = cutoff
+    _state["block"] = block
+
+
+def _score_chunk(task):
+    """
+    Score query rows [start, stop) against the whole corpus.
+    Cosine comes from sparse products one corpus block at a time; since the
+    final score is 0.5 * sequence + 0.5 * cosine, pairs with cosine below
+    2 * cutoff - 1 can never reach the cutoff and skip the sequence ratio.
+    Returns (i, j, score) arrays for pairs at or above the cutoff.
+    """
+    start, stop = task
+    queries, corpus = _state["queries"], _state["corpus"]
+    cutoff, block = _state["cutoff"], _state["block"]
+    floor = max(0.0, 2 * cutoff - 1)
+    chunk = _rows(queries, start, stop)
+    size = int(corpus["shape"][0])
+    found_i, found_j, found_s = [], [], []
+
+    # Self-join: only pairs with j > i, so earlier corpus blocks can be skipped
+    first = start - start % block if _state["self_join"] else 0
+    for lo in range(first, size, block):
+        hi = min(size, lo + block)
+        product = (chunk @ _rows(corpus, lo, hi).T).tocoo()
+        keep = product.data >= floor
+        rows = product.row[keep] + start
+        cols = product.col[keep] + lo
+        cosine = product.data[keep]
+        if _state["self_join"]:
+            upper = cols > rows
+            rows, cols, cosine = rows[upper], cols[upper], cosine[upper]
+        if not len(rows):
+            continue
+        order = np.argsort(rows, kind="stable")
+        rows, cols, cosine = rows[order], cols[order], cosine[order]
+        bounds = np.flatnonzero(np.diff(rows)) + 1
+        for group in np.split(np.arange(len(rows)), bounds):
+            i = int(rows[group[0]])
+            sequence = ratio_many(_name(queries, i), [_name(corpus, int(j)) for j in cols[group]])
+            scores = 0.5 * sequence + 0.5 * cosine[group]
+            hit = scores >= cutoff
+            found_i.append(rows[group][hit])
+            found_j.append(cols[group][hit])
+            found_s.append(scores[hit].astype(np.float32))
+
+    if not found_i:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+    return np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_s)
+
+
+def compare_all(comparator, queries, corpus=None, cutoff: float = SAME_USER_SCORE,
+                workers: int = None, query_chunk: int = QUERY_CHUNK,
+                corpus_block: int = CORPUS_BLOCK):
+    """
+    Many-vs-many comparison across a process pool.
+    Returns an iterator of (i, j, score) for every query i and corpus name j
+    whose compare()-style score (0.5 * sequence ratio + 0.5 * TF-IDF cosine,
+    0-1 scale) is at least `cutoff`. Without a corpus the queries are
+    compared with each other (i < j).
+    `cutoff` must be above 0.5: candidates come from the sparse cosine
+    product, and below that a pair sharing no n-gram (cosine 0) could
+    reach the cutoff on its sequence ratio alone.
+    Both sets are vectorized once in this process and written as .npy
+    files that every worker memory-maps, so no matrix is pickled to the
+    pool; only (start, stop) row ranges go out and result arrays come back,
+    in completion order. workers=1 runs in-process.
+    """
+    if not 0.5 < cutoff <= 1.0:
+        raise ValueError(f"cutoff must be in (0.5, 1], got {cutoff}")
+    return _stream(comparator, queries, corpus, cutoff, workers, query_chunk, corpus_block)
+
+
+def _stream(comparator, queries, corpus, cutoff: float, workers: int, query_chunk: int,
+            corpus_block: int):
+    self_join = corpus is None
+    queries = [comparator.normalize(u) for u in queries]
+    corpus = queries if self_join else [comparator.normalize(u) for u in corpus]
+    if not queries or not corpus:
+        return
+    tasks = [(start, min(len(queries), start + query_chunk))
+             for start in range(0, len(queries), query_chunk)]
+
+    with tempfile.TemporaryDirectory(prefix="user-recon-pairs-", dir=_scratch_dir()) as directory:
+        _dump(directory, "queries", comparator.vectorize(queries), queries)
+        if not self_join:
+            _dump(directory, "corpus", comparator.vectorize(corpus), corpus)
+        init_args = (directory, self_join, cutoff, corpus_block)
+
+        if workers == 1:
+            _init_worker(*init_args)
+            results = map(_score_chunk, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.get_context().Pool(
+                workers, initializer=_init_worker, initargs=init_args
+            )
+            results = pool.imap_unordered(_score_chunk, tasks)
+        try:
+            for rows, cols, scores in results:
+                yield from zip(rows.tolist(), cols.tolist(), scores.tolist())
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            _state.clear()
+
+
+if __name__ == "__main__":
+    import random
+    import string
+    import time
+
+    from user_recon.core.ai_compare import AIUsernameComparator
+
+    random.seed(11)
+    base = ["".join(random.choices(string.ascii_lowercase, k=random.randint(6, 12)))
+            for _ in range(20000)]
+    names = base + [b + str(random.randint(1, 99)) for b in random.sample(base, 2000)]
+    comparator = AIUsernameComparator()
+    for workers in (1, os.cpu_count()):
+        start = time.time()
+        pairs = list(compare_all(comparator, names, workers=workers))
+        print(f"{len(names)} names, all pairs, {workers} worker(s): "
+              f"{len(pairs)} matches in {time.time() - start:.1f}s")
@@ -0,0 +1,129 @@
+# user_recon/core/presence.py
+
+import numpy as np
+
+from user_recon.core.sites import REGISTRY
+
+# -------------------------------
+# Platform presence bitmasks
+# -------------------------------
+# A scan's footprint is two bitsets over registry indices (bit i = the site
+# with SiteDefinition.index i):
+#   found   profile exists
+#   known   conclusive result (found or not found)
+# so not found = known & ~found and unknown = ~known. Overlap between two
+# footprints is a popcount of an AND instead of a walk over result dicts.
+
+_WORDS = {"FOUND": True, "NOT FOUND": False}
+
+
+def popcount(mask: int) -> int:
+    """Number of set bits."""
+    return bin(mask).count("1")
+
+
+def _found(value):
+    """True / False / None from any per-site value a report may hold."""
+    if isinstance(value, dict):
+        return value.get("found")
+    if isinstance(value, (tuple, list)):
+        return value[0] if value else None
+    if isinstance(value, str):
+        return _WORDS.get(value.upper())
+    return value if isinstance(value, bool) else None
+
+
+def presence_masks(results, registry=REGISTRY) -> tuple:
+    """
+    (found, known) bitmasks for a scan's results.
+    Accepts the list of result dicts check_all_sites / ScanEngine return,
+    a {site: result} dict (result dicts, legacy (found, ...) tuples, bools
+    or "FOUND" / "NOT FOUND"), an encoded entry from presence_entry(), or
+    a (found, known) pair. Sites missing from the registry are ignored.
+    """
+    if not results:
+        return 0, 0
+    if isinstance(results, tuple):
+        return results
+    if isinstance(results, dict) and "known" in results and "sites" in results:
+        return int(results["found"], 16), int(results["known"], 16)
+    if isinstance(results, dict):
+        items = results.items()
+    else:
+        items = ((r.get("site"), r) for r in results if isinstance(r, dict))
+
+    found = known = 0
+    for site, value in items:
+        if site not in registry:
+            continue
+        state = _found(value)
+        if state is None:
+            continue
+        bit = 1 << registry[site].index
+        known |= bit
+        if state:
+            found |= bit
+    return found, known
+
+
+def presence_entry(results, registry=REGISTRY) -> dict:
+    """
+    Report-ready footprint: fixed-width hex strings (one digit per four
+    registry sites, bit i = site index i) plus the registry size they cover.
+    """
+    found, known = presence_masks(results, registry)
+    digits = max(1, (len(registry) + 3) // 4)
+    return {"sites": len(registry), "found": format(found, f"0{digits}x"),
+            "known": format(known, f"0{digits}x")}
+
+
+def mask_sites(mask: int, registry=REGISTRY) -> list:
+    """Site names whose bits are set, in registry order."""
+    return [site.name for site in registry if mask >> site.index & 1]
+
+
+def overlap(first, second, registry=REGISTRY) -> dict:
+    """
+    Shared footprint of two scans (any shape presence_masks() accepts).
+    - shared: sites where both were found
+    - checked: sites conclusive in both
+    - jaccard: shared / sites where either was found
+    """
+    found1, known1 = presence_masks(first, registry)
+    found2, known2 = presence_masks(second, registry)
+    shared = popcount(found1 & found2)
+    either = popcount(found1 | found2)
+    return {"shared": shared, "checked": popcount(known1 & known2),
+            "jaccard": shared / either if either else 0.0}
+
+
+# -------------------------------
+# Packed masks (for stored footprints)
+# -------------------------------
+def mask_width(registry=REGISTRY) -> int:
+    """Bytes per packed mask: whole 64-bit words covering every registry site."""
+    return 8 * max(1, (len(registry) + 63) // 64)
+
+
+def pack_mask(mask: int, registry=REGISTRY) -> bytes:
+    """Fixed-width little-endian bytes of a mask."""
+    return mask.to_bytes(mask_width(registry), "little")
+
+
+def unpack_masks(blobs, registry=REGISTRY) -> np.ndarray:
+    """
+    (n, words) uint64 matrix from packed masks. Masks written for a smaller
+    registry are zero-padded, so old rows stay comparable as sites are added.
+    """
+    width = mask_width(registry)
+    raw = b"".join(bytes(b[:width]).ljust(width, b"\0") for b in blobs)
+    return np.frombuffer(raw, dtype="<u8").reshape(-1, width // 8)
+
+
+if __name__ == "__main__":
+    scan1 = [{"site": "GitHub", "found": True}, {"site": "Reddit", "found": True},
+             {"site": "Twitter", "found": False}, {"site": "Twitch", "found": None}]
+    scan2 = {"GitHub": "FOUND", "Reddit": "NOT FOUND", "Twitter": "NOT FOUND"}
+    print(presence_entry(scan1))
+    print(mask_sites(presence_masks(scan1)[0]))
+    print(overlap(scan1, scan2))
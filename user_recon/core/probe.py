@@ -0,0 +1,79 @@
+# user_recon/core/probe.py
+
+import requests
+
+# Probe methods a site can be registered with
+HEAD = "head"
+GET = "get"
+
+# Default cap on body bytes read by a streamed GET probe
+DEFAULT_MAX_BYTES = 16 * 1024
+
+# HEAD responses that mean "this server doesn't do HEAD, ask again with GET"
+HEAD_UNSUPPORTED = {405, 501}
+
+
+class ProbeResponse:
+    """
+    Minimal view of a probe: status, headers, final URL and
+    at most `max_bytes` of body. Never holds the full page.
+    """
+
+    __slots__ = ("status_code", "headers", "url", "body", "method")
+
+    def __init__(self, status_code: int, headers, url: str, body: bytes, method: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self.body = body
+        self.method = method
+
+    def __repr__(self):
+        return f"<ProbeResponse {self.method.upper()} {self.status_code} {len(self.body)}B>"
+
+
+def _read_prefix(resp: requests.Response, max_bytes: int) -> bytes:
+    """Read up to max_bytes of a streamed response body."""
+    if max_bytes <= 0:
+        return b""
+    chunks = []
+    remaining = max_bytes
+    for chunk in resp.iter_content(chunk_size=min(max_bytes, 8192)):
+        chunks.append(chunk[:remaining])
+        remaining -= len(chunk)
+        if remaining <= 0:
+            break
+    return b"".join(chunks)
+
+
+def bounded_get(session, url: str, max_bytes: int = DEFAULT_MAX_BYTES, **kwargs) -> ProbeResponse:
+    """
+    Streamed GET that stops after max_bytes of body.
+    The connection goes back to the pool if the body was fully read,
+    otherwise it is discarded instead of draining the rest of the page.
+    """
+    resp = session.get(url, stream=True, **kwargs)
+    try:
+        body = _read_prefix(resp, max_bytes)
+    finally:
+        resp.close()
+    return ProbeResponse(resp.status_code, resp.headers, resp.url, body, GET)
+
+
+def probe(session, url: str, method: str = HEAD, max_bytes: int = DEFAULT_MAX_BYTES,
+          **kwargs) -> ProbeResponse:
+    """
+    Probe a profile URL with as little transfer as possible.
+    - HEAD first (redirects followed, like GET), falling back to a bounded GET
+      when the server rejects HEAD.
+    - GET reads at most max_bytes of body.
+    """
+    kwargs.setdefault("allow_redirects", True)
+    if method == HEAD:
+        resp = session.head(url, **kwargs)
+        resp.close()
+        if resp.status_code not in HEAD_UNSUPPORTED:
+            return ProbeResponse(resp.status_code, resp.headers, resp.url, b"", HEAD)
+    elif method != GET:
+        raise ValueError(f"Unknown probe method: {method}")
+    return bounded_get(session, url, max_bytes=max_bytes, **kwargs)
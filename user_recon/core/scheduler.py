@@ -0,0 +1,180 @@
+# user_recon/core/scheduler.py
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = {429, 999}
+
+DEFAULT_RATE = 5.0          # requests/second per host
+DEFAULT_BURST = 5.0         # bucket capacity
+DEFAULT_MIN_RATE = 0.2
+DEFAULT_MAX_RATE = 20.0
+DEFAULT_INCREASE = 0.1      # additive increase per success
+DEFAULT_DECREASE = 0.5      # multiplicative decrease per throttle
+DECREASE_COOLDOWN = 1.0     # seconds; a burst of 429s counts as one signal
+DEFAULT_MAX_PAUSE = 10.0    # longest Retry-After pause dispatch waits out
+
+
+class TokenBucket:
+    """
+    Token bucket for one host.
+    Refills at `rate` tokens/second up to `capacity`; can be paused
+    until a wall-clock deadline (e.g. from Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def paused_for(self, now: float) -> float:
+        """Seconds left on a Retry-After pause (0 if not paused)."""
+        return max(0.0, self.paused_until - now)
+
+    def try_take(self, now: float = None) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class HostScheduler:
+    """
+    Politeness scheduler for batch scans.
+    - One token bucket per host; work is dispatched round-robin across hosts
+      so no host sees a burst just because usernames share a site order.
+    - AIMD: a host's rate halves on 429/999 and creeps back up on success.
+    - Never more than `concurrency` jobs in flight across all hosts.
+    - A host paused for longer than `max_pause` is not waited for; its jobs
+      are handed back through run()'s `defer` callback.
+    """
+
+    def __init__(self, concurrency: int, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 min_rate: float = DEFAULT_MIN_RATE, max_rate: float = DEFAULT_MAX_RATE,
+                 increase: float = DEFAULT_INCREASE, decrease: float = DEFAULT_DECREASE,
+                 max_pause: float = DEFAULT_MAX_PAUSE):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.max_pause = max_pause
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Get or create a host's bucket; caller holds the lock."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            return self._bucket(host)
+
+    # -------------------------------
+    # AIMD feedback
+    # -------------------------------
+    def feedback(self, host: str, status: int = None, retry_after: float = None):
+        """Adjust a host's rate from a probe outcome."""
+        with self._lock:
+            bucket = self._bucket(host)
+            if status in THROTTLE_STATUSES:
+                now = time.monotonic()
+                if now - bucket.last_decrease >= DECREASE_COOLDOWN:
+                    bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                    bucket.last_decrease = now
+                bucket.tokens = min(bucket.tokens, 0.0)
+                if retry_after:
+                    bucket.paused_until = max(bucket.paused_until, now + retry_after)
+            elif status is not None:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def rates(self) -> dict:
+        """Current per-host rates (requests/second)."""
+        with self._lock:
+            return {host: round(b.rate, 3) for host, b in self._buckets.items()}
+
+    # -------------------------------
+    # Dispatch
+    # -------------------------------
+    async def run(self, jobs, handler, defer=None, max_pause: float = None):
+        """
+        Run `handler(job)` coroutines for (host, job) pairs,
+        interleaving hosts and respecting buckets and the global limit.
+        If `defer` is given, jobs for a host paused longer than `max_pause`
+        (default self.max_pause) go to `defer(job, seconds_left)` instead.
+        """
+        if max_pause is None:
+            max_pause = self.max_pause
+        pending = {}
+        for host, job in jobs:
+            pending.setdefault(host, deque()).append(job)
+        ring = deque(pending.keys())
+        in_flight = set()
+        try:
+            await self._dispatch(pending, ring, in_flight, handler, defer, max_pause)
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _dispatch(self, pending: dict, ring: deque, in_flight: set, handler, defer,
+                        max_pause: float):
+        while ring or in_flight:
+            now = time.monotonic()
+            next_wake = None
+            # One pass over the ring: at most one dispatch per host per pass
+            for _ in range(len(ring)):
+                if len(in_flight) >= self.concurrency:
+                    break
+                host = ring[0]
+                ring.rotate(-1)
+                with self._lock:
+                    bucket = self._bucket(host)
+                    paused = bucket.paused_for(now)
+                    wait = bucket.try_take(now)
+                if defer is not None and paused > max_pause:
+                    # Don't hold every other host's work behind a long Retry-After
+                    ring.remove(host)
+                    for job in pending.pop(host):
+                        defer(job, paused)
+                    continue
+                if wait > 0:
+                    next_wake = wait if next_wake is None else min(next_wake, wait)
+                    continue
+                queue = pending[host]
+                in_flight.add(asyncio.ensure_future(handler(queue.popleft())))
+                if not queue:
+                    ring.remove(host)
+                    del pending[host]
+
+            if in_flight:
+                # Wake on the first completion, or when the next token is due
+                timeout = next_wake if len(in_flight) < self.concurrency else None
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                in_flight -= done
+                for task in done:
+                    task.result()
+            elif next_wake is not None:
+                await asyncio.sleep(next_wake)
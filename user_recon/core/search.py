@@ -1,92 +1,151 @@
-import requests
 from requests.exceptions import RequestException, Timeout, ConnectionError
 from user_recon.utils.logging import get_logger
-from user_recon.core.security import sanitize_input
-from user_recon.utils.retry_queue import enqueue_retry
+from user_recon.core.security import sanitize_input, validate_username
+from user_recon.core.session import SessionPool, get_session_pool
+from user_recon.core.probe import DEFAULT_MAX_BYTES, probe
+from user_recon.core.sites import REGISTRY
+from user_recon.core.health import DEFAULT_TIMEOUT
+from user_recon.core.fingerprint import SoftNotFoundFingerprints, get_fingerprints, random_username
+from user_recon.utils.retry_queue import enqueue_retry, is_retryable, parse_retry_after
 
 logger = get_logger(__name__)
 
-# Social media and communication platforms
-SITES = {
-    "YouTube": "https://www.youtube.com/{user}",
-    "Reddit": "https://www.reddit.com/user/{user}",
-    "Facebook": "https://www.facebook.com/{user}",
-    "Twitter": "https://www.twitter.com/{user}",
-    "Twitch": "https://www.twitch.tv/{user}",
-    "GitHub": "https://www.github.com/{user}",
-    "Instagram": "https://www.instagram.com/{user}",
-    "Pinterest": "https://www.pinterest.com/{user}",
-    "Roblox": "https://www.roblox.com/user.aspx?username={user}",
-    "Bluesky": "https://bsky.app/profile/{user}.bsky.social",
-    "Sanista": "https://www.sanista.com/{user}",  # placeholder, update if real pattern differs
-    "Telegram": "https://t.me/{user}",
-    "WeChat": "https://www.wechat.com/{user}",    # placeholder, WeChat doesn’t expose usernames publicly
-    "WhatsApp": "https://wa.me/{user}",           # requires phone number in international format
-    "Signal": "https://signal.me/#p/{user}",      # requires phone number, may not resolve for all users
-    "Microsoft Teams": "https://teams.microsoft.com/l/profile/{user}",
-    "TikTok": "https://www.tiktok.com/@{user}",
-    "LinkedIn": "https://www.linkedin.com/in/{user}",
-    "Medium": "https://medium.com/@{user}",
-    "Imgur": "https://imgur.com/user/{user}",
-    "Vimeo": "https://vimeo.com/{user}",
-    "Spotify": "https://open.spotify.com/user/{user}",
-    "Keybase": "https://keybase.io/{user}",
-    "Snapchat": "https://www.snapchat.com/add/{user}",
-    "SoundCloud": "https://soundcloud.com/{user}",
-    "VK": "https://vk.com/{user}",
-}
+# Social media and communication platforms (see core/sites.py for definitions)
+SITES = REGISTRY.url_templates()
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (UserRecon/1.0; +https://github.com/your-org/user-recon)"
 }
 
 
-def check_username(username: str, site: str) -> dict:
+def profile_url(username: str, site: str) -> str:
+    """Profile URL probed for a username on a site."""
+    return REGISTRY[site].url_for(sanitize_input(username))
+
+
+def response_validators(headers) -> dict:
+    """ETag / Last-Modified from a response, for revalidating it later."""
+    validators = {}
+    if headers.get("ETag"):
+        validators["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        validators["last_modified"] = headers["Last-Modified"]
+    return validators
+
+
+def conditional_headers(validators: dict) -> dict:
+    """If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def preflight(username: str, site: str):
+    """
+    Check the username against the site's rules without any I/O.
+    Returns a "not applicable" result dict, or None if the site should be probed.
+    """
+    username = sanitize_input(username)
+    if validate_username(username, site):
+        return None
+    return {
+        "site": site, "url": REGISTRY[site].url_for(username), "found": None,
+        "applicable": False, "error": "not applicable: username violates site rules",
+    }
+
+
+def check_username(username: str, site: str, session_pool: SessionPool = None,
+                   max_bytes: int = DEFAULT_MAX_BYTES, queue_retries: bool = True,
+                   timeout: float = DEFAULT_TIMEOUT,
+                   fingerprints: SoftNotFoundFingerprints = None,
+                   previous: dict = None) -> dict:
     """
     Check if a username exists on a given site.
+    `previous` is the last stored result, revalidated with a conditional request.
     Returns dict with status and reasoning.
     """
+    skipped = preflight(username, site)
+    if skipped is not None:
+        return skipped
+
+    site_def = REGISTRY[site]
     username = sanitize_input(username)
-    url = SITES[site].format(user=username)
+    url = site_def.url_for(username)
+    pool = session_pool or get_session_pool()
+    if site_def.max_bytes is not None:
+        max_bytes = site_def.max_bytes
+
+    headers = HEADERS
+    validators = (previous or {}).get("validators")
+    if validators and previous.get("found") is not None:
+        headers = dict(HEADERS, **conditional_headers(validators))
 
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = probe(pool.get(url), url, method=site_def.method, max_bytes=max_bytes,
+                     headers=headers, timeout=timeout)
         status = resp.status_code
+        if status == 304 and headers is not HEADERS:
+            return {"site": site, "url": url, "found": previous["found"], "status": status,
+                    "unchanged": True, "validators": validators}
+        found = site_def.classify(status, resp.url, resp.body)
 
-        if status == 200:
-            return {"site": site, "url": url, "found": True, "status": status}
-        elif status in (301, 302):
-            return {"site": site, "url": url, "found": True, "status": status}
-        elif status == 404:
-            return {"site": site, "url": url, "found": False, "status": status}
+        if found and site_def.soft_404:
+            def fetch_missing():
+                decoy = site_def.url_for(random_username(site_def))
+                return probe(pool.get(decoy), decoy, method=site_def.method, max_bytes=max_bytes,
+                             headers=HEADERS, timeout=timeout).body
+
+            fingerprints = fingerprints or get_fingerprints()
+            if fingerprints.is_soft_404(site, resp.body, fetch_missing):
+                return {"site": site, "url": url, "found": False, "status": status,
+                        "soft_404": True}
+
+        if found is not None:
+            result = {"site": site, "url": url, "found": found, "status": status}
+            validators = response_validators(resp.headers)
+            if validators:
+                result["validators"] = validators
+            return result
         elif status == 403:
             return {"site": site, "url": url, "found": None, "status": status, "error": "Forbidden"}
         elif status == 429:
-            enqueue_retry(username, site)
-            return {"site": site, "url": url, "found": None, "status": status, "error": "Rate limited"}
+            result = {"site": site, "url": url, "found": None, "status": status,
+                      "error": "Rate limited"}
         elif status == 999:
-            enqueue_retry(username, site)
-            return {"site": site, "url": url, "found": None, "status": status, "error": "Blocked by platform"}
+            result = {"site": site, "url": url, "found": None, "status": status,
+                      "error": "Blocked by platform"}
         else:
-            enqueue_retry(username, site)
-            return {"site": site, "url": url, "found": None, "status": status, "error": "Unhandled response"}
+            result = {"site": site, "url": url, "found": None, "status": status,
+                      "error": "Unhandled response"}
+
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if retry_after is not None:
+            result["retry_after"] = retry_after
 
     except (Timeout, ConnectionError):
-        enqueue_retry(username, site)
-        return {"site": site, "url": url, "found": None, "error": "Network error, queued for retry"}
+        result = {"site": site, "url": url, "found": None,
+                  "error": "Network error, queued for retry"}
     except RequestException as e:
-        enqueue_retry(username, site)
-        return {"site": site, "url": url, "found": None, "error": f"Request failed: {e}"}
+        result = {"site": site, "url": url, "found": None, "error": f"Request failed: {e}"}
+
+    if queue_retries and is_retryable(result):
+        enqueue_retry(username, site, retry_after=result.get("retry_after"),
+                      status=result.get("status"), error=result.get("error"))
+    return result
 
 
-def check_all_sites(username: str) -> list:
+def check_all_sites(username: str, session_pool: SessionPool = None,
+                    max_bytes: int = DEFAULT_MAX_BYTES) -> list:
     """
     Run username check across all platforms.
     Returns list of result dicts.
     """
     results = []
-    for site in SITES.keys():
-        result = check_username(username, site)
+    for site in REGISTRY.names():
+        result = check_username(username, site, session_pool=session_pool, max_bytes=max_bytes)
         results.append(result)
         logger.info(f"[{site}] {result}")
     return results
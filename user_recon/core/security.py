@@ -6,6 +6,8 @@ import time
 import threading
 from collections import defaultdict
 
+from user_recon.core.sites import REGISTRY
+
 
 class SecurityUtils:
     """
@@ -43,10 +45,20 @@ class SecurityUtils:
             return re.sub(r"[^a-zA-Z0-9._-]", "", text)
         return text
 
-    def validate_username(self, username: str) -> bool:
-        """Allow only alphanumeric, underscore, dot, and dash."""
+    def validate_username(self, username: str, site: str = None) -> bool:
+        """
+        Allow only alphanumeric, underscore, dot, and dash.
+        With `site`, check the platform's own charset/length rules instead.
+        """
+        if site is not None:
+            return REGISTRY[site].accepts(username)
         return bool(re.match(r"^[a-zA-Z0-9._-]{3,32}$", username))
 
+    def applicable_sites(self, username: str, sites=None) -> list:
+        """Sites (default: all registered) whose rules the username satisfies."""
+        names = REGISTRY.names() if sites is None else sites
+        return [site for site in names if self.validate_username(username, site)]
+
     # -------------------------------
     # API Key Vault
     # -------------------------------
@@ -100,6 +112,20 @@ class SecurityUtils:
         return warnings
 
 
+# Shared instance backing the module-level helpers
+_default_security = SecurityUtils()
+
+
+def sanitize_input(text: str) -> str:
+    """Module-level shortcut for SecurityUtils.sanitize_input."""
+    return _default_security.sanitize_input(text)
+
+
+def validate_username(username: str, site: str = None) -> bool:
+    """Module-level shortcut for SecurityUtils.validate_username."""
+    return _default_security.validate_username(username, site)
+
+
 if __name__ == "__main__":
     sec = SecurityUtils()
     # Demo
@@ -108,5 +134,6 @@ if __name__ == "__main__":
         print(f"Testing {u}")
         print("Sanitized:", sec.sanitize_input(u))
         print("Valid?:", sec.validate_username(u))
+        print("Twitter?:", sec.validate_username(u, "Twitter"))
         print("Suspicious:", sec.detect_suspicious_activity(u))
         print("-" * 40)
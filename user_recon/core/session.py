@@ -0,0 +1,121 @@
+# user_recon/core/session.py
+
+import atexit
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections kept per platform host
+DEFAULT_POOL_MAXSIZE = 8
+# Host pools cached per session: the platform host plus the hosts its
+# redirects land on (CDN, login, regional domains)
+DEFAULT_POOL_HOSTS = 4
+
+
+class SessionPool:
+    """
+    Keep-alive HTTP session pool for the search subsystem.
+    Holds one requests.Session per platform host, each with a bounded
+    connection pool, so repeated probes reuse TCP+TLS connections
+    across sites and across usernames in a batch.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, pool_block: bool = True,
+                 pool_hosts: int = DEFAULT_POOL_HOSTS):
+        if pool_maxsize < 1:
+            raise ValueError("pool_maxsize must be at least 1")
+        if pool_hosts < 1:
+            raise ValueError("pool_hosts must be at least 1")
+        self.pool_maxsize = pool_maxsize
+        self.pool_hosts = pool_hosts
+        self.pool_block = pool_block
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the scheme://host[:port] key a URL is pooled under."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_hosts,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """Return the pooled session for the URL's host, creating it on first use."""
+        key = self.host_key(url)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SessionPool is closed")
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._new_session()
+                self._sessions[key] = session
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the host's pooled session."""
+        return self.get(url).request(method, url, **kwargs)
+
+    def hosts(self) -> list:
+        """List hosts that currently hold a session."""
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def close(self):
+        """Close every session and drop its idle connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._closed = True
+        for session in sessions:
+            session.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# -------------------------------
+# Process-wide default pool
+# -------------------------------
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """Return the shared pool used when callers don't bring their own."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None or _default_pool.closed:
+            _default_pool = SessionPool()
+        return _default_pool
+
+
+def close_session_pool():
+    """Shut down the shared pool (registered to run at interpreter exit)."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
+
+
+atexit.register(close_session_pool)
@@ -0,0 +1,199 @@
+# user_recon/core/sites.py
+
+import re
+from urllib.parse import urlsplit
+
+from user_recon.core.probe import HEAD, GET
+
+# -------------------------------
+# Site definitions
+# -------------------------------
+# One dict per platform. Only "name" and "url" are required.
+#   method          HEAD (default) or GET; body markers need GET
+#   found_status    statuses that mean "profile page served" (default 200, 301, 302)
+#   missing_status  statuses that mean "no such user" (default 404)
+#   missing_redirect  substrings of the final URL that mean "no such user"
+#   missing_body    substrings of the body prefix that mean "no such user"
+#   found_body      substrings of the body prefix required to confirm a profile
+#   soft_404        True if the site serves 200 for unknown users; responses are
+#                   compared against a fingerprint of a random username's page (GET only)
+#   max_bytes       body byte budget for GET probes (default: engine-wide cap)
+#   charset, min_len, max_len   username rules, compiled to ^[charset]{min,max}$
+#   username_pattern  full regex instead of charset/min/max (e.g. phone numbers)
+SITE_DEFINITIONS = [
+    {"name": "YouTube", "url": "https://www.youtube.com/{user}",
+     "charset": "A-Za-z0-9._-", "min_len": 3, "max_len": 30},
+    {"name": "Reddit", "url": "https://www.reddit.com/user/{user}",
+     "charset": "A-Za-z0-9_-", "min_len": 3, "max_len": 20},
+    {"name": "Facebook", "url": "https://www.facebook.com/{user}", "method": GET, "soft_404": True,
+     "charset": "A-Za-z0-9.", "min_len": 5, "max_len": 50},
+    {"name": "Twitter", "url": "https://www.twitter.com/{user}",
+     "charset": "A-Za-z0-9_", "min_len": 1, "max_len": 15},
+    {"name": "Twitch", "url": "https://www.twitch.tv/{user}", "method": GET, "soft_404": True,
+     "charset": "A-Za-z0-9_", "min_len": 4, "max_len": 25},
+    {"name": "GitHub", "url": "https://www.github.com/{user}",
+     "username_pattern": r"^[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38}$"},
+    {"name": "Instagram", "url": "https://www.instagram.com/{user}", "method": GET,
+     "missing_redirect": ["/accounts/login"],
+     "charset": "A-Za-z0-9._", "min_len": 1, "max_len": 30},
+    {"name": "Pinterest", "url": "https://www.pinterest.com/{user}",
+     "charset": "A-Za-z0-9_", "min_len": 3, "max_len": 30},
+    {"name": "Roblox", "url": "https://www.roblox.com/user.aspx?username={user}",
+     "missing_redirect": ["request-error"],
+     "charset": "A-Za-z0-9_", "min_len": 3, "max_len": 20},
+    {"name": "Bluesky", "url": "https://bsky.app/profile/{user}.bsky.social",
+     "charset": "A-Za-z0-9-", "min_len": 3, "max_len": 18},
+    # placeholder, update if real pattern differs
+    {"name": "Sanista", "url": "https://www.sanista.com/{user}"},
+    {"name": "Telegram", "url": "https://t.me/{user}", "method": GET, "max_bytes": 32 * 1024,
+     "found_body": ["tgme_page_title"],
+     "charset": "A-Za-z0-9_", "min_len": 5, "max_len": 32},
+    # placeholder, WeChat doesn't expose usernames publicly
+    {"name": "WeChat", "url": "https://www.wechat.com/{user}"},
+    # requires phone number in international format
+    {"name": "WhatsApp", "url": "https://wa.me/{user}",
+     "username_pattern": r"^\+?[0-9]{7,15}$"},
+    # requires phone number, may not resolve for all users
+    {"name": "Signal", "url": "https://signal.me/#p/{user}",
+     "username_pattern": r"^\+?[0-9]{7,15}$"},
+    {"name": "Microsoft Teams", "url": "https://teams.microsoft.com/l/profile/{user}"},
+    {"name": "TikTok", "url": "https://www.tiktok.com/@{user}", "method": GET, "soft_404": True,
+     "charset": "A-Za-z0-9_.", "min_len": 2, "max_len": 24},
+    {"name": "LinkedIn", "url": "https://www.linkedin.com/in/{user}", "method": GET,
+     "charset": "A-Za-z0-9-", "min_len": 3, "max_len": 100},
+    {"name": "Medium", "url": "https://medium.com/@{user}",
+     "charset": "A-Za-z0-9._", "min_len": 1, "max_len": 30},
+    {"name": "Imgur", "url": "https://imgur.com/user/{user}",
+     "charset": "A-Za-z0-9", "min_len": 4, "max_len": 63},
+    {"name": "Vimeo", "url": "https://vimeo.com/{user}",
+     "charset": "A-Za-z0-9_", "min_len": 3, "max_len": 64},
+    {"name": "Spotify", "url": "https://open.spotify.com/user/{user}", "method": GET,
+     "soft_404": True},
+    {"name": "Keybase", "url": "https://keybase.io/{user}",
+     "charset": "A-Za-z0-9_", "min_len": 2, "max_len": 16},
+    {"name": "Snapchat", "url": "https://www.snapchat.com/add/{user}", "method": GET,
+     "username_pattern": r"^[A-Za-z][A-Za-z0-9._-]{2,14}$"},
+    {"name": "SoundCloud", "url": "https://soundcloud.com/{user}",
+     "charset": "A-Za-z0-9_-", "min_len": 3, "max_len": 25},
+    {"name": "VK", "url": "https://vk.com/{user}",
+     "charset": "A-Za-z0-9_.", "min_len": 5, "max_len": 32},
+]
+
+DEFAULT_FOUND_STATUS = (200, 301, 302)
+DEFAULT_MISSING_STATUS = (404,)
+
+
+def _marker_regex(markers, as_bytes: bool):
+    """Compile a list of literal markers into one alternation (or None)."""
+    if not markers:
+        return None
+    if as_bytes:
+        return re.compile(b"|".join(re.escape(m.encode("utf-8")) for m in markers))
+    return re.compile("|".join(re.escape(m) for m in markers))
+
+
+class SiteDefinition:
+    """
+    One compiled site definition.
+    Everything a probe needs is precomputed at load time, so classifying
+    a response is a couple of set lookups and at most two regex searches.
+    """
+
+    __slots__ = (
+        "name", "index", "url", "host", "method", "max_bytes",
+        "found_status", "missing_status", "missing_redirect", "missing_body", "found_body",
+        "soft_404", "username_re",
+    )
+
+    def __init__(self, index: int, spec: dict):
+        self.name = spec["name"]
+        self.index = index
+        self.url = spec["url"]
+        parts = urlsplit(self.url)
+        self.host = f"{parts.scheme}://{parts.netloc}".lower()
+        self.method = spec.get("method", HEAD)
+        if self.method not in (HEAD, GET):
+            raise ValueError(f"{self.name}: unknown method {self.method!r}")
+        self.max_bytes = spec.get("max_bytes")
+        self.found_status = frozenset(spec.get("found_status", DEFAULT_FOUND_STATUS))
+        self.missing_status = frozenset(spec.get("missing_status", DEFAULT_MISSING_STATUS))
+        self.missing_redirect = _marker_regex(spec.get("missing_redirect"), as_bytes=False)
+        self.missing_body = _marker_regex(spec.get("missing_body"), as_bytes=True)
+        self.found_body = _marker_regex(spec.get("found_body"), as_bytes=True)
+        self.soft_404 = bool(spec.get("soft_404", False))
+        if (self.missing_body or self.found_body or self.soft_404) and self.method != GET:
+            raise ValueError(f"{self.name}: body markers need method GET")
+
+        pattern = spec.get("username_pattern")
+        if pattern is None and "charset" in spec:
+            pattern = f"^[{spec['charset']}]{{{spec.get('min_len', 1)},{spec.get('max_len', '')}}}$"
+        self.username_re = re.compile(pattern) if pattern else None
+
+    def accepts(self, username: str) -> bool:
+        """True if the username can exist on this site (no rules means any)."""
+        return self.username_re is None or self.username_re.fullmatch(username) is not None
+
+    def url_for(self, username: str) -> str:
+        return self.url.format(user=username)
+
+    def classify(self, status: int, final_url: str = "", body: bytes = b""):
+        """
+        Decide found / not found from a probe response.
+        Returns True, False, or None when the status isn't conclusive
+        (the caller maps those to Forbidden / Rate limited / ...).
+        """
+        if status in self.missing_status:
+            return False
+        if status not in self.found_status:
+            return None
+        if self.missing_redirect is not None and self.missing_redirect.search(final_url or ""):
+            return False
+        if self.missing_body is not None and self.missing_body.search(body):
+            return False
+        if self.found_body is not None and not self.found_body.search(body):
+            return False
+        return True
+
+    def __repr__(self):
+        return f"<SiteDefinition {self.name} {self.method.upper()} {self.url}>"
+
+
+class SiteRegistry:
+    """
+    Ordered, name-indexed registry of compiled site definitions.
+    Built once at import; lookups are a dict access regardless of size.
+    """
+
+    def __init__(self, definitions: list):
+        self._sites = {}
+        for spec in definitions:
+            if spec["name"] in self._sites:
+                raise ValueError(f"Duplicate site definition: {spec['name']}")
+            self._sites[spec["name"]] = SiteDefinition(len(self._sites), spec)
+
+    def __getitem__(self, name: str) -> SiteDefinition:
+        return self._sites[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sites
+
+    def __iter__(self):
+        return iter(self._sites.values())
+
+    def __len__(self) -> int:
+        return len(self._sites)
+
+    def names(self) -> list:
+        return list(self._sites.keys())
+
+    def url_templates(self) -> dict:
+        """Legacy {name: url_template} view."""
+        return {name: site.url for name, site in self._sites.items()}
+
+
+REGISTRY = SiteRegistry(SITE_DEFINITIONS)
+
+
+if __name__ == "__main__":
+    for site in REGISTRY:
+        print(site)
@@ -0,0 +1,290 @@
+# user_recon/core/store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from user_recon.core.presence import pack_mask, presence_masks, unpack_masks
+from user_recon.utils.similarity import popcount_words
+
+DEFAULT_DB_PATH = "results/history.db"
+DEFAULT_BATCH_SIZE = 200
+FOOTPRINT_BATCH = 50000         # presence rows scored per popcount pass
+
+
+class ResultStore:
+    """
+    Persistent scan history (SQLite, WAL mode).
+    - `results`: every probe outcome ever recorded, indexed by username,
+      site and time for history queries.
+    - `latest`: the newest conclusive outcome per (username, site), which
+      incremental rescans read to decide what is still fresh and which
+      carries the ETag / Last-Modified validators for conditional requests.
+    - `presence`: per username, packed found / known bitmasks over the
+      site registry (see core/presence.py), kept in step with `latest`, so
+      footprint-overlap queries are a popcount over one column.
+    - `reports`: full pipeline reports.
+    Writes are buffered and committed in batches of `batch_size`.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                site TEXT NOT NULL,
+                found INTEGER,
+                status INTEGER,
+                result TEXT NOT NULL,
+                checked_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_user_site
+                ON results (username, site, checked_at);
+            CREATE INDEX IF NOT EXISTS idx_results_site ON results (site, checked_at);
+            CREATE INDEX IF NOT EXISTS idx_results_time ON results (checked_at);
+            CREATE TABLE IF NOT EXISTS latest (
+                username TEXT NOT NULL,
+                site TEXT NOT NULL,
+                found INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (username, site)
+            );
+            CREATE INDEX IF NOT EXISTS idx_latest_time ON latest (checked_at);
+            CREATE TABLE IF NOT EXISTS presence (
+                username TEXT PRIMARY KEY,
+                found BLOB NOT NULL,
+                known BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                report TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_reports_user ON reports (username, created_at);
+            """
+        )
+        self._db.commit()
+        # Databases written before the presence table existed: build it once
+        if self._db.execute("SELECT 1 FROM presence LIMIT 1").fetchone() is None:
+            with self._db:
+                self._update_presence(
+                    [r[0] for r in self._db.execute("SELECT DISTINCT username FROM latest")]
+                )
+
+    # -------------------------------
+    # Writes
+    # -------------------------------
+    def record(self, username: str, result: dict, checked_at: float = None):
+        """Buffer one probe result; commits once `batch_size` are pending."""
+        with self._lock:
+            self._pending.append((username, result, checked_at or time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Commit every buffered result in one transaction."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Caller holds the lock."""
+        if not self._pending:
+            return
+        rows = []
+        latest = []
+        for username, result, checked_at in self._pending:
+            found = result.get("found")
+            found = None if found is None else int(found)
+            payload = json.dumps(result)
+            rows.append((username, result["site"], found, result.get("status"), payload,
+                         checked_at))
+            if found is not None:
+                latest.append((username, result["site"], found, payload, checked_at))
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO results (username, site, found, status, result, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.executemany(
+                "INSERT INTO latest (username, site, found, result, checked_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(username, site) DO UPDATE SET found = excluded.found, "
+                "result = excluded.result, checked_at = excluded.checked_at "
+                "WHERE excluded.checked_at >= latest.checked_at",
+                latest,
+            )
+            self._update_presence({row[0] for row in latest})
+        self._pending.clear()
+
+    def _update_presence(self, usernames):
+        """Rebuild the presence masks of `usernames` from `latest` (inside a transaction)."""
+        now = time.time()
+        for username in usernames:
+            rows = self._db.execute(
+                "SELECT site, found FROM latest WHERE username = ?", (username,)
+            ).fetchall()
+            found, known = presence_masks({site: bool(f) for site, f in rows})
+            self._db.execute(
+                "INSERT OR REPLACE INTO presence (username, found, known, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (username, pack_mask(found), pack_mask(known), now),
+            )
+
+    def save_report(self, report: dict) -> int:
+        """Store a full pipeline report; also flushes buffered results."""
+        with self._lock:
+            self._flush()
+            with self._db:
+                cur = self._db.execute(
+                    "INSERT INTO reports (username, report, created_at) VALUES (?, ?, ?)",
+                    (report["username"], json.dumps(report), time.time()),
+                )
+            return cur.lastrowid
+
+    # -------------------------------
+    # Reads
+    # -------------------------------
+    def latest(self, username: str, sites: list) -> dict:
+        """
+        Newest stored conclusive result per site, whatever its age, with its
+        `checked_at` time. Returns {site: result} for sites that have one.
+        """
+        sites = list(sites)
+        if not sites:
+            return {}
+        self.flush()
+        placeholders = ",".join("?" * len(sites))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT site, result, checked_at FROM latest "
+                f"WHERE username = ? AND site IN ({placeholders})",
+                [username, *sites],
+            ).fetchall()
+        return {
+            site: dict(json.loads(raw), checked_at=checked_at) for site, raw, checked_at in rows
+        }
+
+    def fresh(self, username: str, sites: list, max_age: float) -> dict:
+        """
+        Stored conclusive results younger than `max_age` seconds.
+        Returns {site: result}; sites missing from it need a new probe.
+        """
+        cutoff = time.time() - max_age
+        return {site: result for site, result in self.latest(username, sites).items()
+                if result["checked_at"] >= cutoff}
+
+    def history(self, username: str, site: str = None, limit: int = 100) -> list:
+        """Recorded results for a username (optionally one site), newest first."""
+        self.flush()
+        query = "SELECT result, checked_at FROM results WHERE username = ?"
+        params = [username]
+        if site is not None:
+            query += " AND site = ?"
+            params.append(site)
+        query += " ORDER BY checked_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [dict(json.loads(raw), checked_at=checked_at) for raw, checked_at in rows]
+
+    def presence(self, username: str) -> tuple:
+        """Stored (found, known) bitmasks for a username; (0, 0) if never scanned."""
+        self.flush()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT found, known FROM presence WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            return 0, 0
+        return tuple(int.from_bytes(bytes(b), "little") for b in row)
+
+    def shared_footprint(self, footprint, min_shared: int = 1, limit: int = 50) -> list:
+        """
+        Stored usernames whose found sites overlap a footprint (a scan's
+        results, a presence entry or a (found, known) pair; see core/presence.py).
+        Returns dicts with username, shared (sites found for both) and
+        jaccard (shared / sites found for either), best first.
+        """
+        found, _ = presence_masks(footprint)
+        if not found or limit <= 0:
+            return []
+        target = unpack_masks([pack_mask(found)])
+        target_bits = int(popcount_words(target)[0])
+        self.flush()
+        matches = []
+        with self._lock:
+            cursor = self._db.execute("SELECT username, found FROM presence")
+            while True:
+                rows = cursor.fetchmany(FOOTPRINT_BATCH)
+                if not rows:
+                    break
+                masks = unpack_masks([row[1] for row in rows])
+                shared = popcount_words(masks & target)
+                either = popcount_words(masks) + target_bits - shared
+                for i in np.flatnonzero(shared >= max(1, min_shared)):
+                    matches.append({"username": rows[i][0], "shared": int(shared[i]),
+                                    "jaccard": round(float(shared[i] / either[i]), 4)})
+        matches.sort(key=lambda m: (m["jaccard"], m["shared"]), reverse=True)
+        return matches[:limit]
+
+    def latest_report(self, username: str):
+        """Most recent stored report for a username, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT report FROM reports WHERE username = ? ORDER BY created_at DESC LIMIT 1",
+                (username,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stale_usernames(self, max_age: float) -> list:
+        """Usernames with at least one stored result older than `max_age` seconds."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT username FROM latest WHERE checked_at < ?",
+                (time.time() - max_age,),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ResultStore(os.path.join(directory, "history.db")) as store:
+            store.record("elhamjvdi", {"site": "GitHub", "found": True, "status": 200})
+            store.record("elhamjvdi", {"site": "Reddit", "found": None, "error": "Timeout"})
+            print(store.fresh("elhamjvdi", ["GitHub", "Reddit"], max_age=3600))
+            print(store.history("elhamjvdi"))
+            store.record("elham87jvdi", {"site": "GitHub", "found": True, "status": 200})
+            print(store.shared_footprint(store.presence("elhamjvdi")))
@@ -2,17 +2,34 @@
 
 import argparse
 import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 
-from user_recon.core.search import SocialSearch
-from user_recon.util.entropy import Entropy
-from user_recon.util.anomaly import AnomalyDetector
-from user_recon.util.reasoning import ReasoningEngine
-from user_recon.util.predictive import PredictiveEngine
-from user_recon.util.logging import Logger
+from user_recon.core.engine import ScanEngine, DEFAULT_CONCURRENCY
+from user_recon.core.cache import ProbeCache, RedisProbeCache
+from user_recon.core.bloom import NegativeFilter
+from user_recon.core.deadline import as_deadline
+from user_recon.core.presence import presence_entry
+from user_recon.core.store import ResultStore
+from user_recon.core.cluster import UsernameClusterer, DEFAULT_THRESHOLD
+from user_recon.utils.retry_queue import RetryWorker, get_retry_queue
+from user_recon.utils.work_queue import (
+    RedisWorkQueue, QueueWorker, DEFAULT_REDIS_URL, DEFAULT_QUEUE, DEFAULT_VISIBILITY_TIMEOUT,
+)
+from user_recon.utils.entropy import Entropy
+from user_recon.utils.anamoly import AnomalyDetector
+from user_recon.utils.reasoning import ReasoningEngine
+from user_recon.utils.predictive import PredictiveEngine
+from user_recon.utils.logging import Logger
 
 
-def run_user_recon(username: str, verbose: bool = False) -> dict:
+def run_user_recon(username: str, verbose: bool = False,
+                   concurrency: int = DEFAULT_CONCURRENCY, cache=None,
+                   engine: ScanEngine = None, on_result=None,
+                   negative_filter: NegativeFilter = None, deadline=None,
+                   store: ResultStore = None, max_age: float = None) -> dict:
     """
     Orchestrates full User Recon pipeline:
     - Social media search
@@ -20,8 +37,11 @@ def run_user_recon(username: str, verbose: bool = False) -> dict:
     - Similarity reasoning
     - Predictive alias generation
     - Anomaly detection
+    Pass a shared `engine` to reuse it across usernames; `on_result` sees
+    each site result as it completes, and `deadline` bounds the whole run.
     """
 
+    deadline = as_deadline(deadline)
     results = {
         "username": username,
         "timestamp": datetime.utcnow().isoformat(),
@@ -30,10 +50,27 @@ def run_user_recon(username: str, verbose: bool = False) -> dict:
 
     # 1. Social search
     Logger.info(f"Searching platforms for '{username}'...")
-    search = SocialSearch(username)
-    social_results = search.run_search()
+    scan_stats = ScanEngine.new_stats()
+    owns_engine = engine is None
+    if owns_engine:
+        engine = ScanEngine(concurrency=concurrency, cache=cache,
+                            negative_filter=negative_filter, store=store, max_age=max_age)
+    social_results = []
+    try:
+        for result in engine.stream(username, stats=scan_stats, deadline=deadline):
+            if on_result is not None:
+                on_result(result)
+            social_results.append(result)
+    finally:
+        if owns_engine:
+            engine.close()
+    # Report in registry order regardless of completion order
+    site_order = {site: i for i, site in enumerate(engine.sites)}
+    social_results.sort(key=lambda r: site_order[r["site"]])
 
     results["analysis"]["social_presence"] = social_results
+    results["analysis"]["presence"] = presence_entry(social_results)
+    results["analysis"]["scan_stats"] = scan_stats
 
     # 2. Entropy analysis
     entropy_val = Entropy.shannon_entropy(username)
@@ -46,6 +83,13 @@ def run_user_recon(username: str, verbose: bool = False) -> dict:
         "class": entropy_class
     }
 
+    if deadline is not None and deadline.expired:
+        Logger.warning("Deadline exceeded, skipping alias and anomaly stages")
+        results["analysis"]["skipped_stages"] = ["predicted_aliases", "anomaly_reports"]
+        if engine.store is not None:
+            engine.store.save_report(results)
+        return results
+
     # 3. Predictive aliases
     Logger.info("Generating predictive aliases...")
     predictions = PredictiveEngine.predict_future_aliases(username)
@@ -71,21 +115,147 @@ def run_user_recon(username: str, verbose: bool = False) -> dict:
 
     results["analysis"]["anomaly_reports"] = anomaly_explanations
 
+    if engine.store is not None:
+        engine.store.save_report(results)
+
     # Final summary
     Logger.success("Recon complete.")
     return results
 
 
-def cli():
+def read_usernames(stream):
+    """Yield usernames from a text stream: one per line, blanks and #comments skipped."""
+    for line in stream:
+        name = line.strip()
+        if name and not name.startswith("#"):
+            yield name
+
+
+def completed_usernames(path: str) -> set:
+    """Usernames already present in an NDJSON output file (for --resume)."""
+    done = set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["username"])
+                except (ValueError, KeyError, TypeError):
+                    # Ignore a truncated last line from an interrupted run
+                    continue
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def run_batch(usernames, out, engine: ScanEngine, jobs: int = 4, skip: set = None,
+              deadline: float = None) -> int:
+    """
+    Run the pipeline over an iterable of usernames with at most `jobs`
+    usernames in flight, writing each report to `out` as one NDJSON line
+    the moment it finishes. `deadline` is a per-username budget in seconds.
+    Returns the number of reports written.
+    """
+    skip = set(skip or ())
+    written = 0
+
+    def flush(done):
+        nonlocal written
+        for future in done:
+            username = pending.pop(future)
+            try:
+                report = future.result()
+            except Exception as e:
+                Logger.error(f"Recon failed for '{username}': {e}")
+                continue
+            out.write(json.dumps(report) + "\n")
+            out.flush()
+            written += 1
+
+    pending = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for username in usernames:
+            if username in skip:
+                continue
+            skip.add(username)
+            if len(pending) >= jobs:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                flush(done)
+            future = pool.submit(run_user_recon, username, engine=engine, deadline=deadline)
+            pending[future] = username
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            flush(done)
+    return written
+
+
+def cli(argv=None):
     parser = argparse.ArgumentParser(description="User Recon - AI-driven OSINT tool for usernames")
-    parser.add_argument("username", help="Target username to analyze")
-    parser.add_argument("-o", "--output", help="Save results to JSON file", default=None)
+    parser.add_argument("username", nargs="?", help="Target username to analyze")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Save results to JSON file (NDJSON in batch mode)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum number of site probes in flight")
+    parser.add_argument("--cache-db", default=None,
+                        help="SQLite file for a probe cache that persists between runs")
+    parser.add_argument("--cache-redis", default=None, metavar="URL",
+                        help="Redis URL for a probe cache shared between workers")
+    parser.add_argument("--negative-filter", default=None, metavar="DIR",
+                        help="Directory of per-site Bloom filters of confirmed misses; "
+                             "known misses are skipped without a request")
+    parser.add_argument("-i", "--input", metavar="FILE", default=None,
+                        help="Batch mode: file of usernames, one per line ('-' for stdin); "
+                             "reports are written as NDJSON")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+                        help="Batch mode: usernames scanned at the same time")
+    parser.add_argument("--resume", action="store_true",
+                        help="Batch mode: skip usernames already in the --output file")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="Time budget per username; unfinished sites are reported "
+                             "as incomplete")
+    parser.add_argument("--store", default=None, metavar="DB",
+                        help="SQLite scan history; every result and report is saved to it")
+    parser.add_argument("--max-age", type=float, default=None, metavar="SECONDS",
+                        help="Incremental rescan: only re-probe sites whose stored result "
+                             "is older than this (needs --store)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if not args.username and not args.input:
+        parser.error("a username or --input FILE is required")
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be positive")
+    if args.max_age is not None and not args.store:
+        parser.error("--max-age needs --store")
     Logger.verbose = args.verbose
 
-    report = run_user_recon(args.username, verbose=args.verbose)
+    cache = None
+    if args.cache_redis:
+        cache = RedisProbeCache(url=args.cache_redis)
+    elif args.cache_db:
+        cache = ProbeCache(disk_path=args.cache_db)
+    negative_filter = NegativeFilter(args.negative_filter) if args.negative_filter else None
+    store = ResultStore(args.store) if args.store else None
+
+    if args.input:
+        try:
+            run_batch_cli(args, cache, negative_filter, store)
+        finally:
+            for resource in (cache, negative_filter, store):
+                if resource is not None:
+                    resource.close()
+        return
+
+    try:
+        report = run_user_recon(args.username, verbose=args.verbose,
+                                concurrency=args.concurrency, cache=cache,
+                                negative_filter=negative_filter, deadline=args.deadline,
+                                store=store, max_age=args.max_age)
+    finally:
+        for resource in (cache, negative_filter, store):
+            if resource is not None:
+                resource.close()
 
     # Print to console
     print(json.dumps(report, indent=4))
@@ -95,7 +265,221 @@ def cli():
         with open(args.output, "w") as f:
             json.dump(report, f, indent=4)
         Logger.info(f"Results saved to {args.output}")
+        # Let the retry worker merge late results into this report, from any cwd
+        get_retry_queue().attach_report(args.username, os.path.abspath(args.output))
+
+
+def run_batch_cli(args, cache, negative_filter=None, store=None):
+    """Batch mode for cli(): stream NDJSON reports to --output or stdout."""
+    skip = completed_usernames(args.output) if args.resume else set()
+    if skip:
+        Logger.info(f"Resuming: {len(skip)} usernames already done")
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = sys.stdout
+    if args.output:
+        out = open(args.output, "a" if args.resume else "w", encoding="utf-8")
+    if args.resume and out.tell() > 0:
+        # Start on a fresh line if the previous run died mid-write
+        with open(args.output, "rb") as f:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                out.write("\n")
+    try:
+        with ScanEngine(concurrency=args.concurrency, cache=cache,
+                        negative_filter=negative_filter, store=store,
+                        max_age=args.max_age) as engine:
+            written = run_batch(read_usernames(source), out, engine, jobs=args.jobs, skip=skip,
+                                deadline=args.deadline)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    Logger.info(f"Batch complete: {written} reports written")
+
+
+def add_queue_arguments(parser):
+    parser.add_argument("--redis", default=DEFAULT_REDIS_URL, metavar="URL",
+                        help="Redis URL of the work queue")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE, help="Work queue name")
+
+
+def worker_cli(argv):
+    """`user-recon worker`: serve scan jobs from the Redis work queue until interrupted."""
+    parser = argparse.ArgumentParser(prog="user-recon worker",
+                                     description="Run scan jobs from a Redis work queue")
+    add_queue_arguments(parser)
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum number of site probes in flight")
+    parser.add_argument("--cache-redis", default=None, metavar="URL",
+                        help="Redis URL for a probe cache shared between workers")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="Time budget per username unless the job sets one")
+    parser.add_argument("--visibility-timeout", type=float, default=DEFAULT_VISIBILITY_TIMEOUT,
+                        metavar="SECONDS",
+                        help="Seconds before an unacknowledged job is handed to another worker")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args(argv)
+    Logger.verbose = args.verbose
+
+    queue = RedisWorkQueue(url=args.redis, name=args.queue,
+                           visibility_timeout=args.visibility_timeout)
+    cache = RedisProbeCache(url=args.cache_redis) if args.cache_redis else None
+    try:
+        with ScanEngine(concurrency=args.concurrency, cache=cache) as engine:
+            def handle(job):
+                deadline = job.get("deadline") or args.deadline
+                return run_user_recon(job["username"], engine=engine, deadline=deadline)
+
+            worker = QueueWorker(queue, handle)
+            Logger.info(f"Worker serving {args.queue} ({queue.counts()})")
+            try:
+                worker.run()
+            except KeyboardInterrupt:
+                worker.stop()
+            Logger.info(f"Worker stopped after {worker.processed} jobs")
+    finally:
+        if cache is not None:
+            cache.close()
+        queue.close()
+
+
+def enqueue_cli(argv):
+    """`user-recon enqueue`: queue a batch of usernames, optionally waiting for the reports."""
+    parser = argparse.ArgumentParser(prog="user-recon enqueue",
+                                     description="Queue usernames for scan workers")
+    add_queue_arguments(parser)
+    parser.add_argument("-i", "--input", metavar="FILE", default="-",
+                        help="File of usernames, one per line ('-' for stdin)")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="Time budget per username")
+    parser.add_argument("--wait", action="store_true",
+                        help="Wait for the reports and write them as NDJSON")
+    parser.add_argument("-o", "--output", default=None,
+                        help="With --wait: NDJSON file for the reports (default stdout)")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="With --wait: give up after this long without a report")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        usernames = list(dict.fromkeys(read_usernames(source)))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    queue = RedisWorkQueue(url=args.redis, name=args.queue)
+    try:
+        batch = queue.enqueue(usernames, deadline=args.deadline)
+        Logger.info(f"Batch {batch}: {len(usernames)} usernames queued")
+        if not args.wait:
+            print(batch)
+            return
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        received = 0
+        try:
+            for report in queue.results(batch, len(usernames), timeout=args.timeout):
+                out.write(json.dumps(report) + "\n")
+                out.flush()
+                received += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        Logger.info(f"Batch {batch}: {received}/{len(usernames)} reports received")
+    finally:
+        queue.close()
+
+
+def cluster_cli(argv):
+    """`user-recon cluster`: group probable aliases in a username list."""
+    parser = argparse.ArgumentParser(prog="user-recon cluster",
+                                     description="Group probable aliases in a username list")
+    parser.add_argument("-i", "--input", metavar="FILE", default="-",
+                        help="File of usernames, one per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="NDJSON file for the clusters (default stdout)")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum pair score (0-1) to merge two names")
+    parser.add_argument("--min-size", type=int, default=2,
+                        help="Smallest cluster to report")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        usernames = list(dict.fromkeys(read_usernames(source)))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    written = 0
+    try:
+        clusterer = UsernameClusterer(threshold=args.threshold)
+        for cluster in clusterer.clusters(usernames, min_size=args.min_size):
+            out.write(json.dumps(cluster) + "\n")
+            written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    Logger.info(f"{written} clusters from {len(usernames)} usernames")
+
+
+def retry_cli(argv):
+    """`user-recon retry`: drain the retry queue, merging late results into saved reports."""
+    parser = argparse.ArgumentParser(prog="user-recon retry",
+                                     description="Re-probe queued transient failures and merge "
+                                                 "late results into their saved reports")
+    parser.add_argument("--once", action="store_true",
+                        help="Drain the entries due now and exit instead of running until "
+                             "interrupted")
+    parser.add_argument("--interval", type=float, default=5.0, metavar="SECONDS",
+                        help="Idle wait between queue polls")
+    parser.add_argument("--store", default=None, metavar="DB",
+                        help="SQLite scan history to record late results in")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args(argv)
+    Logger.verbose = args.verbose
+
+    store = ResultStore(args.store) if args.store else None
+    worker = RetryWorker(interval=args.interval, store=store)
+    Logger.info(f"Retry queue: {worker.queue.counts()}")
+    try:
+        if args.once:
+            drained = 0
+            while True:
+                batch = worker.drain_once()
+                if not batch:
+                    break
+                drained += batch
+            Logger.info(f"Drained {drained} due retries")
+            return
+        worker.start()
+        try:
+            while worker.is_alive():
+                worker.join(1.0)
+        except KeyboardInterrupt:
+            worker.stop()
+        Logger.info(f"Retry worker stopped ({worker.queue.counts()})")
+    finally:
+        if store is not None:
+            store.close()
+
+
+SUBCOMMANDS = {"worker": worker_cli, "enqueue": enqueue_cli, "cluster": cluster_cli,
+               "retry": retry_cli}
+
+
+def run(argv=None):
+    """
+    Console entry point: `user-recon worker|enqueue|cluster|retry ...`,
+    otherwise the scan CLI.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    return cli(argv)
 
 
 if __name__ == "__main__":
-    cli()
+    run()
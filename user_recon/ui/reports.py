@@ -2,6 +2,7 @@
 
 import json
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
@@ -16,6 +17,15 @@ class ReportUI:
     Combines AI analysis, pattern recognition, entropy, anomaly, and predictions.
     """
 
+    @staticmethod
+    def describe_result(result: dict) -> str:
+        """One-word status for a check_username result dict."""
+        if result.get("found") is True:
+            return "FOUND"
+        if result.get("found") is False:
+            return "NOT FOUND"
+        return result.get("error", "UNKNOWN")
+
     @staticmethod
     def show_report(report: dict):
         username = report.get("username", "N/A")
@@ -35,7 +45,11 @@ class ReportUI:
             table = Table(title="🌍 Social Media Presence", box=ROUNDED, style="cyan")
             table.add_column("Platform", style="bold yellow")
             table.add_column("Status", style="bold green")
-            for platform, status in social.items():
+            if isinstance(social, dict):
+                rows = social.items()
+            else:
+                rows = ((r.get("site"), ReportUI.describe_result(r)) for r in social)
+            for platform, status in rows:
                 table.add_row(platform, str(status))
             console.print(table)
 
@@ -88,6 +102,30 @@ class ReportUI:
         console.print(f"[cyan]Report saved to[/cyan] [bold green]{path}[/bold green]")
 
 
+class LivePresenceTable:
+    """
+    Live-updating social presence table.
+    Use as the `on_result` callback of run_user_recon (or feed it results
+    from ScanEngine.stream) to show each site the moment it completes.
+    """
+
+    def __init__(self, username: str):
+        self.table = Table(title=f"🌍 Scanning {username}", box=ROUNDED, style="cyan")
+        self.table.add_column("Platform", style="bold yellow")
+        self.table.add_column("Status", style="bold green")
+        self.live = Live(self.table, console=console, refresh_per_second=8)
+
+    def __call__(self, result: dict):
+        self.table.add_row(result.get("site", "?"), ReportUI.describe_result(result))
+
+    def __enter__(self):
+        self.live.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.live.stop()
+
+
 if __name__ == "__main__":
     # Demo run
     sample = {
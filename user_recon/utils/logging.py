@@ -52,6 +52,20 @@ class LogManager:
             self.logger.addHandler(console_handler)
             self.logger.addHandler(file_handler)
 
+    @property
+    def verbose(self) -> bool:
+        """True when the console shows DEBUG messages."""
+        return any(h.level <= logging.DEBUG for h in self._console_handlers())
+
+    @verbose.setter
+    def verbose(self, enabled: bool):
+        for handler in self._console_handlers():
+            handler.setLevel(logging.DEBUG if enabled else logging.INFO)
+
+    def _console_handlers(self):
+        return [h for h in self.logger.handlers
+                if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)]
+
     class ColorFormatter(logging.Formatter):
         """Custom formatter for colored console logs."""
 
@@ -69,6 +83,10 @@ class LogManager:
     def info(self, msg, *args, **kwargs):
         self.logger.info(msg, *args, **kwargs)
 
+    def success(self, msg, *args, **kwargs):
+        """INFO-level message highlighted as a completed step."""
+        self.logger.info(f"{Fore.GREEN}{Style.BRIGHT}{msg}{Style.RESET_ALL}", *args, **kwargs)
+
     def warning(self, msg, *args, **kwargs):
         self.logger.warning(msg, *args, **kwargs)
 
@@ -79,8 +97,17 @@ class LogManager:
         self.logger.critical(msg, *args, **kwargs)
 
 
-# Global logger instance
-log = LogManager().logger
+# Global logger instances: Logger for the CLI's shortcut methods, log for plain logging
+Logger = LogManager()
+log = Logger.logger
+
+
+def get_logger(name: str = "UserRecon") -> logging.Logger:
+    """Return the shared UserRecon logger, or a named child of it."""
+    if not name or name == log.name:
+        return log
+    return log.getChild(name)
+
 
 if __name__ == "__main__":
     lm = LogManager()
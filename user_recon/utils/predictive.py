@@ -2,8 +2,8 @@
 
 import re
 from typing import List, Dict
-from difflib import SequenceMatcher
 from .entropy import Entropy
+from .similarity import ratio, ratio_many
 
 
 class PredictiveEngine:
@@ -37,12 +37,14 @@ class PredictiveEngine:
         return list(set(v for v in variants if v != username))
 
     @staticmethod
-    def likelihood_score(user: str, candidate: str) -> Dict[str, float]:
+    def likelihood_score(user: str, candidate: str, sim_ratio: float = None) -> Dict[str, float]:
         """
         Estimate likelihood that 'candidate' is an alias of 'user'.
         Uses string similarity + entropy style comparison.
+        Pass `sim_ratio` if the similarity was already computed in a batch.
         """
-        sim_ratio = SequenceMatcher(None, user, candidate).ratio()
+        if sim_ratio is None:
+            sim_ratio = ratio(user, candidate)
         ent_diff = abs(Entropy.shannon_entropy(user) - Entropy.shannon_entropy(candidate))
 
         # Combine factors into a probability-style score
@@ -63,7 +65,9 @@ class PredictiveEngine:
         Generate variants and assign likelihood scores for each.
         """
         variants = PredictiveEngine.generate_variants(username)
-        return [PredictiveEngine.likelihood_score(username, v) for v in variants]
+        ratios = ratio_many(username, variants)
+        return [PredictiveEngine.likelihood_score(username, v, float(r))
+                for v, r in zip(variants, ratios)]
 
 
 if __name__ == "__main__":
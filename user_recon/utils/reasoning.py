@@ -1,8 +1,8 @@
 # user_recon/util/reasoning.py
 
 from typing import Dict, Any
-from difflib import SequenceMatcher
 from .entropy import Entropy
+from .similarity import ratio
 
 
 class ReasoningEngine:
@@ -17,8 +17,7 @@ class ReasoningEngine:
         Compare two usernames and explain similarity.
         Returns dict with similarity %, reasoning, and entropy notes.
         """
-        ratio = SequenceMatcher(None, user1, user2).ratio()
-        similarity = round(ratio * 100, 2)
+        similarity = round(ratio(user1, user2) * 100, 2)
 
         ent1 = Entropy.shannon_entropy(user1)
         ent2 = Entropy.shannon_entropy(user2)
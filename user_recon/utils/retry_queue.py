@@ -0,0 +1,362 @@
+# user_recon/utils/retry_queue.py
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from user_recon.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = "results/retry_queue.db"
+DEFAULT_BASE_DELAY = 30.0
+DEFAULT_MAX_DELAY = 3600.0
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Statuses that are worth another try later
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504, 999}
+
+
+def parse_retry_after(value) -> float:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+    Returns seconds to wait, or None if absent/unparseable.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def is_retryable(result: dict) -> bool:
+    """True if a check_username result is a transient failure."""
+    if result.get("found") is not None:
+        return False
+    status = result.get("status")
+    return status is None or status in RETRYABLE_STATUSES
+
+
+class RetryQueue:
+    """
+    Durable retry queue for rate-limited / failed probes (SQLite, WAL mode).
+    - One pending entry per (username, site).
+    - Exponential backoff with jitter, never earlier than the site's Retry-After.
+    - Entries that exhaust max_attempts are kept as 'failed' for inspection.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS retries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                site TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_at REAL NOT NULL,
+                last_status INTEGER,
+                last_error TEXT,
+                report_path TEXT,
+                state TEXT NOT NULL DEFAULT 'pending',
+                created_at REAL NOT NULL,
+                UNIQUE (username, site)
+            );
+            CREATE INDEX IF NOT EXISTS idx_retries_due ON retries (state, next_at);
+            CREATE TABLE IF NOT EXISTS site_holds (
+                site TEXT PRIMARY KEY,
+                until REAL NOT NULL
+            );
+            """
+        )
+        self._db.commit()
+
+    # -------------------------------
+    # Scheduling
+    # -------------------------------
+    def backoff(self, attempts: int, retry_after: float = None) -> float:
+        """Delay before the next try: jittered exponential, floored by Retry-After."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempts))
+        delay = cap / 2 + random.uniform(0, cap / 2)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _hold_site(self, site: str, retry_after: float, now: float):
+        """Remember a site-wide Retry-After so no entry for it is due earlier."""
+        if retry_after is None:
+            return
+        self._db.execute(
+            "INSERT INTO site_holds (site, until) VALUES (?, ?) "
+            "ON CONFLICT(site) DO UPDATE SET until = MAX(until, excluded.until)",
+            (site, now + retry_after),
+        )
+
+    def enqueue(self, username: str, site: str, retry_after: float = None,
+                status: int = None, error: str = None, report_path: str = None):
+        """Queue (or refresh) a retry. An already pending entry keeps its schedule."""
+        now = time.time()
+        next_at = now + self.backoff(0, retry_after)
+        with self._lock:
+            self._hold_site(site, retry_after, now)
+            self._db.execute(
+                """
+                INSERT INTO retries (username, site, next_at, last_status, last_error,
+                                     report_path, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(username, site) DO UPDATE SET
+                    last_status = excluded.last_status,
+                    last_error = excluded.last_error,
+                    report_path = COALESCE(excluded.report_path, retries.report_path),
+                    next_at = CASE WHEN retries.state = 'pending'
+                                   THEN MAX(retries.next_at, excluded.next_at)
+                                   ELSE excluded.next_at END,
+                    attempts = CASE WHEN retries.state = 'pending' THEN retries.attempts ELSE 0 END,
+                    state = 'pending'
+                """,
+                (username, site, next_at, status, error, report_path, now),
+            )
+            self._db.commit()
+
+    def attach_report(self, username: str, report_path: str) -> int:
+        """Point pending retries for a username at the report they should update."""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE retries SET report_path = ? WHERE username = ? AND state = 'pending'",
+                (report_path, username),
+            )
+            self._db.commit()
+            return cur.rowcount
+
+    def due(self, limit: int = 20) -> list:
+        """Pending entries whose backoff and site hold have both elapsed."""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT r.id, r.username, r.site, r.attempts, r.report_path
+                FROM retries r LEFT JOIN site_holds h ON h.site = r.site
+                WHERE r.state = 'pending' AND r.next_at <= ? AND COALESCE(h.until, 0) <= ?
+                ORDER BY r.next_at
+                LIMIT ?
+                """,
+                (now, now, limit),
+            ).fetchall()
+        return [
+            {"id": r[0], "username": r[1], "site": r[2], "attempts": r[3], "report_path": r[4]}
+            for r in rows
+        ]
+
+    def complete(self, entry_id: int):
+        """Drop an entry after a conclusive result."""
+        with self._lock:
+            self._db.execute("DELETE FROM retries WHERE id = ?", (entry_id,))
+            self._db.commit()
+
+    def reschedule(self, entry: dict, retry_after: float = None, status: int = None,
+                   error: str = None) -> bool:
+        """
+        Push an entry back with a longer backoff.
+        Returns False once max_attempts is reached (entry marked 'failed').
+        """
+        attempts = entry["attempts"] + 1
+        now = time.time()
+        with self._lock:
+            self._hold_site(entry["site"], retry_after, now)
+            if attempts >= self.max_attempts:
+                self._db.execute(
+                    "UPDATE retries SET attempts = ?, state = 'failed', last_status = ?, "
+                    "last_error = ? WHERE id = ?",
+                    (attempts, status, error, entry["id"]),
+                )
+                self._db.commit()
+                return False
+            self._db.execute(
+                "UPDATE retries SET attempts = ?, next_at = ?, last_status = ?, last_error = ? "
+                "WHERE id = ?",
+                (attempts, now + self.backoff(attempts, retry_after), status, error, entry["id"]),
+            )
+            self._db.commit()
+            return True
+
+    def counts(self) -> dict:
+        """Number of entries per state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM retries GROUP BY state").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# -------------------------------
+# Process-wide default queue
+# -------------------------------
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def get_retry_queue() -> RetryQueue:
+    """Return the shared queue at DEFAULT_DB_PATH, opening it on first use."""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = RetryQueue()
+        return _default_queue
+
+
+def enqueue_retry(username: str, site: str, retry_after: float = None, status: int = None,
+                  error: str = None, report_path: str = None):
+    """
+    Queue a probe for a later retry on the shared queue.
+    Queue failures are logged, never raised into the scan.
+    """
+    try:
+        get_retry_queue().enqueue(username, site, retry_after=retry_after, status=status,
+                                  error=error, report_path=report_path)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not queue retry for {username}@{site}: {e}")
+
+
+# -------------------------------
+# Report merging
+# -------------------------------
+def merge_into_report(report_path: str, result: dict) -> bool:
+    """
+    Replace a site's entry in a saved JSON report with a late result.
+    Written atomically; returns False if the report is missing.
+    """
+    try:
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    presence = report.setdefault("analysis", {}).setdefault("social_presence", [])
+    for i, entry in enumerate(presence):
+        if isinstance(entry, dict) and entry.get("site") == result.get("site"):
+            presence[i] = result
+            break
+    else:
+        presence.append(result)
+    if "presence" in report["analysis"]:
+        # Imported here: core.search imports this module
+        from user_recon.core.presence import presence_entry
+
+        report["analysis"]["presence"] = presence_entry(presence)
+
+    tmp_path = report_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    os.replace(tmp_path, report_path)
+    return True
+
+
+class RetryWorker(threading.Thread):
+    """
+    Background drain worker.
+    Re-runs check_username for due entries, reschedules transient failures
+    and merges conclusive late results back into their stored reports
+    (and the scan history, if a ResultStore is given).
+    """
+
+    def __init__(self, queue: RetryQueue = None, interval: float = 5.0, batch_size: int = 20,
+                 on_result=None, session_pool=None, store=None):
+        super().__init__(name="user-recon-retry-worker", daemon=True)
+        self.queue = queue or get_retry_queue()
+        self.interval = interval
+        self.batch_size = batch_size
+        self.on_result = on_result
+        self.session_pool = session_pool
+        self.store = store
+        self._stop_event = threading.Event()
+
+    def drain_once(self) -> int:
+        """Process one batch of due entries. Returns how many were attempted."""
+        # Imported here: core.search imports this module
+        from user_recon.core.search import check_username
+
+        entries = self.queue.due(limit=self.batch_size)
+        for entry in entries:
+            result = check_username(entry["username"], entry["site"],
+                                    session_pool=self.session_pool, queue_retries=False)
+            if is_retryable(result):
+                kept = self.queue.reschedule(
+                    entry, retry_after=result.pop("retry_after", None),
+                    status=result.get("status"), error=result.get("error"),
+                )
+                if not kept:
+                    logger.warning(f"Giving up on {entry['username']}@{entry['site']}")
+                continue
+
+            result.pop("retry_after", None)
+            if result.get("found") is None:
+                # A permanent error (e.g. 400 / 410) is not a late result worth merging
+                logger.warning(f"Giving up on {entry['username']}@{entry['site']}: "
+                               f"{result.get('error')}")
+                self.queue.complete(entry["id"])
+                continue
+            result["retried"] = entry["attempts"] + 1
+            if entry["report_path"] and not merge_into_report(entry["report_path"], result):
+                # Keep the entry: the report may be unreadable only for now
+                logger.warning(f"Could not merge {entry['username']}@{entry['site']} into "
+                               f"{entry['report_path']}, rescheduling")
+                if not self.queue.reschedule(entry, status=result.get("status"),
+                                             error="report merge failed"):
+                    logger.warning(f"Giving up on {entry['username']}@{entry['site']}")
+                continue
+            if self.store is not None:
+                self.store.record(entry["username"], result)
+            if self.on_result is not None:
+                self.on_result(entry["username"], result)
+            self.queue.complete(entry["id"])
+            logger.info(f"[retry] {entry['username']}@{entry['site']} -> {result}")
+        if self.store is not None:
+            self.store.flush()
+        return len(entries)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                drained = self.drain_once()
+            except Exception as e:
+                logger.error(f"Retry worker error: {e}")
+                drained = 0
+            if not drained:
+                self._stop_event.wait(self.interval)
+
+    def stop(self, timeout: float = None):
+        self._stop_event.set()
+        self.join(timeout)
+
+
+if __name__ == "__main__":
+    # Drain the default queue in the foreground until interrupted
+    worker = RetryWorker()
+    print("Pending retries:", worker.queue.counts())
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(1.0)
+    except KeyboardInterrupt:
+        worker.stop()
@@ -7,7 +7,7 @@ import socket
 import platform
 import threading
 from datetime import datetime
-from user_recon.util.helpers import Helpers
+from user_recon.utils.helpers import Helpers
 
 
 class Telemetry:
@@ -60,6 +60,17 @@ class Telemetry:
             },
         )
 
+    def log_circuit_state(self, site: str, state: str, failures: int):
+        """Telemetry event for a site's circuit breaker changing state."""
+        self.log_event(
+            "circuit_breaker",
+            {
+                "site": site,
+                "state": state,
+                "consecutive_failures": failures,
+            },
+        )
+
     def session_summary(self):
         """Summarize current session performance."""
         runtime = round(time.time() - self.start_time, 2)
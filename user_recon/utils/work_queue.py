@@ -0,0 +1,273 @@
+# user_recon/utils/work_queue.py
+
+import json
+import threading
+import time
+import uuid
+
+from user_recon.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_QUEUE = "user_recon:jobs"
+DEFAULT_VISIBILITY_TIMEOUT = 300.0  # seconds a claimed job stays invisible to other workers
+DEFAULT_MAX_DELIVERIES = 5          # claims before a job is moved to the dead-letter list
+RESULT_TTL = 24 * 3600              # seconds a batch's results list is kept
+BLOCK_SLICE = 1.0                   # longest single blocking call (under client socket timeouts)
+
+
+class RedisWorkQueue:
+    """
+    Reliable Redis work queue for distributed scans.
+    - Job ids move atomically from `<name>:pending` to `<name>:processing`
+      when claimed; payloads live in the `<name>:jobs` hash.
+    - A claim holds a lease (`<name>:leases`, scored by expiry). Jobs whose
+      lease runs out, e.g. because the worker died, are put back by reap().
+    - ack() pushes the report to the batch's results list and drops the job
+      in one transaction, so every job is answered at least once.
+    - A job claimed `max_deliveries` times without an ack goes to `<name>:dead`.
+    A given `client` is used as-is instead of connecting to `url`.
+    """
+
+    def __init__(self, client=None, url: str = DEFAULT_REDIS_URL, name: str = DEFAULT_QUEUE,
+                 visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+                 max_deliveries: int = DEFAULT_MAX_DELIVERIES):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.name = name
+        self.visibility_timeout = visibility_timeout
+        self.max_deliveries = max_deliveries
+        self.pending_key = f"{name}:pending"
+        self.processing_key = f"{name}:processing"
+        self.leases_key = f"{name}:leases"
+        self.jobs_key = f"{name}:jobs"
+        self.deliveries_key = f"{name}:deliveries"
+        self.dead_key = f"{name}:dead"
+
+    def results_key(self, batch: str) -> str:
+        return f"{self.name}:results:{batch}"
+
+    # -------------------------------
+    # Producer side
+    # -------------------------------
+    def enqueue(self, usernames, batch: str = None, deadline: float = None) -> str:
+        """Queue one job per username. Returns the batch id results are pushed under."""
+        batch = batch or uuid.uuid4().hex
+        pipe = self.client.pipeline(transaction=False)
+        count = 0
+        for username in usernames:
+            job_id = uuid.uuid4().hex
+            payload = {"id": job_id, "username": username, "batch": batch, "deadline": deadline}
+            pipe.hset(self.jobs_key, job_id, json.dumps(payload))
+            pipe.lpush(self.pending_key, job_id)
+            count += 1
+            if count % 500 == 0:
+                pipe.execute()
+        pipe.execute()
+        logger.info(f"Queued {count} jobs in batch {batch}")
+        return batch
+
+    def results(self, batch: str, count: int, timeout: float = None):
+        """
+        Yield up to `count` reports for a batch as workers push them.
+        Stops early if nothing arrives for `timeout` seconds.
+        """
+        key = self.results_key(batch)
+        for _ in range(count):
+            item = self._blocking(lambda wait: self.client.brpop([key], timeout=wait), timeout)
+            if item is None:
+                return
+            yield json.loads(item[1])
+
+    @staticmethod
+    def _blocking(call, timeout: float = None):
+        """
+        Run a blocking command as a series of waits of at most BLOCK_SLICE
+        seconds, so a client with a socket timeout (redis-py's default is
+        5s) never gives up mid-wait. Returns None once `timeout` passes
+        (never, if it is None or 0).
+        """
+        end = time.monotonic() + timeout if timeout else None
+        while True:
+            wait = BLOCK_SLICE if end is None else min(BLOCK_SLICE, end - time.monotonic())
+            if wait <= 0:
+                return None
+            result = call(wait)
+            if result is not None:
+                return result
+
+    # -------------------------------
+    # Worker side
+    # -------------------------------
+    def claim(self, block: float = 5.0):
+        """
+        Take the next job and lease it for `visibility_timeout` seconds.
+        Returns the job dict, or None if nothing arrived within `block` seconds.
+        """
+        raw_id = self._blocking(
+            lambda wait: self.client.blmove(self.pending_key, self.processing_key, wait,
+                                            src="RIGHT", dest="LEFT"),
+            block,
+        )
+        if raw_id is None:
+            return None
+        job_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zadd(self.leases_key, {job_id: time.time() + self.visibility_timeout})
+        pipe.hincrby(self.deliveries_key, job_id, 1)
+        pipe.hget(self.jobs_key, job_id)
+        _, deliveries, raw = pipe.execute()
+        if raw is None:
+            # Already acked; a reaper raced us and delivered it twice
+            self._forget(job_id)
+            return None
+        job = json.loads(raw)
+        job["deliveries"] = deliveries
+        return job
+
+    def extend(self, job: dict):
+        """Push a running job's lease out by another visibility timeout."""
+        self.client.zadd(self.leases_key, {job["id"]: time.time() + self.visibility_timeout},
+                         xx=True)
+
+    def ack(self, job: dict, report: dict):
+        """Deliver a job's report and remove the job, atomically."""
+        key = self.results_key(job["batch"])
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lpush(key, json.dumps(report))
+        pipe.expire(key, RESULT_TTL)
+        self._forget(job["id"], pipe)
+        pipe.execute()
+
+    def release(self, job: dict):
+        """Give a job back right away (e.g. after a failure) instead of waiting for its lease."""
+        self._requeue(job["id"])
+
+    def _forget(self, job_id: str, pipe=None):
+        own = pipe is None
+        pipe = pipe or self.client.pipeline(transaction=True)
+        pipe.lrem(self.processing_key, 1, job_id)
+        pipe.zrem(self.leases_key, job_id)
+        pipe.hdel(self.jobs_key, job_id)
+        pipe.hdel(self.deliveries_key, job_id)
+        if own:
+            pipe.execute()
+
+    def _requeue(self, job_id: str):
+        """Move a processing job back to pending, or to the dead list if it keeps failing."""
+        deliveries = int(self.client.hget(self.deliveries_key, job_id) or 0)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lrem(self.processing_key, 1, job_id)
+        pipe.zrem(self.leases_key, job_id)
+        if deliveries >= self.max_deliveries:
+            pipe.lpush(self.dead_key, job_id)
+            logger.warning(f"Job {job_id} failed {deliveries} times, moved to {self.dead_key}")
+        else:
+            # Right end: next in line for BLMOVE
+            pipe.rpush(self.pending_key, job_id)
+        pipe.execute()
+
+    def reap(self) -> int:
+        """Return jobs with expired leases to the queue. Returns how many were moved."""
+        now = time.time()
+        moved = 0
+        for raw_id in self.client.lrange(self.processing_key, 0, -1):
+            job_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+            expires = self.client.zscore(self.leases_key, job_id)
+            if expires is None:
+                # Claimed but the lease write never landed (worker died in between)
+                self.client.zadd(self.leases_key, {job_id: now + self.visibility_timeout}, nx=True)
+            elif expires <= now:
+                self._requeue(job_id)
+                moved += 1
+        return moved
+
+    def counts(self) -> dict:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.llen(self.pending_key)
+        pipe.llen(self.processing_key)
+        pipe.llen(self.dead_key)
+        pending, processing, dead = pipe.execute()
+        return {"pending": pending, "processing": processing, "dead": dead}
+
+    def close(self):
+        self.client.close()
+
+
+class _Heartbeat(threading.Thread):
+    """Keeps extending a job's lease while it runs."""
+
+    def __init__(self, queue: RedisWorkQueue, job: dict):
+        super().__init__(name="user-recon-heartbeat", daemon=True)
+        self.queue = queue
+        self.job = job
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.queue.visibility_timeout / 3):
+            try:
+                self.queue.extend(self.job)
+            except Exception as e:
+                logger.warning(f"Lease extension failed for job {self.job['id']}: {e}")
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class QueueWorker:
+    """
+    Scan worker loop: claim a job, run `handler(job)` to get its report,
+    ack it. Failed jobs are released for another worker. Expired leases
+    are reaped every `reap_interval` seconds by whichever worker gets there.
+    """
+
+    def __init__(self, queue: RedisWorkQueue, handler, reap_interval: float = 30.0,
+                 block: float = 5.0):
+        self.queue = queue
+        self.handler = handler
+        self.reap_interval = reap_interval
+        self.block = block
+        self.processed = 0
+        self._stop_event = threading.Event()
+        self._last_reap = 0.0
+
+    def run_once(self) -> bool:
+        """Process at most one job. Returns True if one was claimed."""
+        if time.time() - self._last_reap >= self.reap_interval:
+            self._last_reap = time.time()
+            moved = self.queue.reap()
+            if moved:
+                logger.info(f"Requeued {moved} jobs with expired leases")
+
+        job = self.queue.claim(block=self.block)
+        if job is None:
+            return False
+        heartbeat = _Heartbeat(self.queue, job)
+        heartbeat.start()
+        try:
+            report = self.handler(job)
+        except Exception as e:
+            logger.error(f"Job {job['id']} ({job['username']}) failed: {e}")
+            heartbeat.stop()
+            self.queue.release(job)
+            return True
+        heartbeat.stop()
+        self.queue.ack(job, report)
+        self.processed += 1
+        return True
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Redis hiccup: back off and keep serving
+                logger.error(f"Work queue error: {e}")
+                self._stop_event.wait(self.block)
+
+    def stop(self):
+        self._stop_event.set()